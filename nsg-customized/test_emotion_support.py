@@ -17,6 +17,22 @@ def load_module_from_path(module_name: str, file_path: str):
     spec.loader.exec_module(module)
     return module
 
+# gen-srt-from-vvproj.pyのパス（モジュール読み込み時に1回だけ組み立てる）
+_GEN_SRT_PATH = Path(__file__).parent / "gen-srt-from-vvproj.py"
+
+# 読み込み済みのgen-srt-from-vvproj.py（各テストで再実行しないよう1回だけ読み込む）
+_GEN_SRT_MODULE = None
+
+def get_gen_srt_module():
+    """gen-srt-from-vvproj.pyを初回のみ動的インポートし、以降は同じモジュールを返す"""
+    global _GEN_SRT_MODULE
+    if _GEN_SRT_MODULE is None:
+        # 存在確認は読み込み前に毎回行う（読み込み後はキャッシュを返すだけ）
+        if not _GEN_SRT_PATH.exists():
+            raise FileNotFoundError(_GEN_SRT_PATH)
+        _GEN_SRT_MODULE = load_module_from_path("gen_srt_from_vvproj", str(_GEN_SRT_PATH))
+    return _GEN_SRT_MODULE
+
 def test_emotional_expression_handler():
     """感情表現ハンドラーのテスト"""
     print("=" * 60)
@@ -24,12 +40,12 @@ def test_emotional_expression_handler():
     print("=" * 60)
     
     # gen-srt-from-vvproj.pyを動的インポート
-    gen_srt_path = Path(__file__).parent / "gen-srt-from-vvproj.py"
-    if not gen_srt_path.exists():
-        print(f"Error: gen-srt-from-vvproj.py not found: {gen_srt_path}")
+    try:
+        gen_srt_module = get_gen_srt_module()
+    except FileNotFoundError:
+        print(f"Error: gen-srt-from-vvproj.py not found: {_GEN_SRT_PATH}")
         return False
     
-    gen_srt_module = load_module_from_path("gen_srt_from_vvproj", str(gen_srt_path))
     handler = gen_srt_module.EmotionalExpressionHandler()
     
     # テストケース
@@ -78,10 +94,10 @@ def test_natural_segmentation():
     print("📝 自然分割機能のテスト")
     print("=" * 60)
     
-    # gen-srt-from-vvproj.pyを動的インポート
-    gen_srt_path = Path(__file__).parent / "gen-srt-from-vvproj.py"
-    gen_srt_module = load_module_from_path("gen_srt_from_vvproj", str(gen_srt_path))
+    # gen-srt-from-vvproj.pyを動的インポート（読み込み済みなら再利用）
+    gen_srt_module = get_gen_srt_module()
     segmentator = gen_srt_module.NaturalSegmentator()
+    emotion_handler = gen_srt_module.EmotionalExpressionHandler()
     
     # Street Fighter 6実況のテストケース
     test_texts = [
@@ -108,7 +124,6 @@ def test_natural_segmentation():
                 status = "✅" if char_count <= 26 else "❌"
                 
                 # 感情表現チェック
-                emotion_handler = gen_srt_module.EmotionalExpressionHandler()
                 is_allowed = emotion_handler.is_chars_allowed_with_emotion(line, 26)
                 emotion_status = "✅感情表現許容" if is_allowed and char_count > 26 else ""
                 
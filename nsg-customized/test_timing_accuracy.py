@@ -10,6 +10,14 @@ import json
 import sys
 from pathlib import Path
 import importlib.util
+import numpy as np
+
+# orjson（オプション）があればVVPROJの読み込みに使用
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 def load_module_from_path(module_name: str, file_path: str):
     """指定パスからモジュールを動的インポート"""
@@ -20,8 +28,11 @@ def load_module_from_path(module_name: str, file_path: str):
 
 def load_vvproj(vvproj_path: str):
     """VVPROJファイルを読み込み"""
-    with open(vvproj_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    # バイト列のまま読み込み、テキストI/O層でのデコードを省く
+    data = Path(vvproj_path).read_bytes()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
 
 def calculate_original_script_time(vvproj_data):
     """元スクリプトの時間計算を再現"""
@@ -31,35 +42,33 @@ def calculate_original_script_time(vvproj_data):
     if not audio_keys:
         audio_keys = list(audio_items.keys())
     
-    total_time = 0.0
+    # 各アイテムの前後無音と音素長を配列に集め、合計はNumPyで一括計算する
+    phoneme_lengths = []
     
     for audio_key in audio_keys:
-        if audio_key not in audio_items:
+        audio_item = audio_items.get(audio_key)
+        if audio_item is None:
             continue
         
-        audio_item = audio_items[audio_key]
         query_data = audio_item.get('query', {})
         
         # prePhonemeLength + postPhonemeLength
-        item_time = query_data.get('prePhonemeLength', 0.0) + query_data.get('postPhonemeLength', 0.0)
+        phoneme_lengths.append(query_data.get('prePhonemeLength', 0.0))
+        phoneme_lengths.append(query_data.get('postPhonemeLength', 0.0))
         
         # アクセント句内の音素時間を合計（元スクリプト方式）
         for phrase_data in query_data.get('accentPhrases', []):
             for mora_data in phrase_data.get('moras', []):
-                item_time += mora_data.get('vowelLength', 0.0)
-                if mora_data.get('consonantLength'):
-                    item_time += mora_data.get('consonantLength', 0.0)
+                phoneme_lengths.append(mora_data.get('vowelLength', 0.0))
+                phoneme_lengths.append(mora_data.get('consonantLength') or 0.0)
             
             # pauseMoraの処理
-            if phrase_data.get('pauseMora'):
-                pause_data = phrase_data['pauseMora']
-                item_time += pause_data.get('vowelLength', 0.0)
-                if pause_data.get('consonantLength'):
-                    item_time += pause_data.get('consonantLength', 0.0)
-        
-        total_time += item_time
+            pause_data = phrase_data.get('pauseMora')
+            if pause_data:
+                phoneme_lengths.append(pause_data.get('vowelLength', 0.0))
+                phoneme_lengths.append(pause_data.get('consonantLength') or 0.0)
     
-    return total_time
+    return float(np.asarray(phoneme_lengths, dtype=np.float64).sum())
 
 def calculate_new_script_time(vvproj_data, gen_srt_module):
     """新しいgen-srt-from-vvproj.pyの時間計算"""
@@ -73,11 +82,10 @@ def calculate_new_script_time(vvproj_data, gen_srt_module):
     total_time = 0.0
     
     for audio_key in audio_keys:
-        if audio_key not in audio_items:
+        audio_item = audio_items.get(audio_key)
+        if audio_item is None:
             continue
         
-        audio_item = audio_items[audio_key]
-        
         # AudioQueryに変換
         audio_query = generator._vvproj_to_audio_query(audio_item)
         
@@ -14,70 +14,157 @@ Author: AI Assistant
 Version: 1.0
 """
 
+import heapq
 import sys
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
 import re
+import numpy as np
+
+# SRTタイムスタンプ行のパターン（ブロックごとに使うため事前コンパイル）
+SRT_TIME_PATTERN = re.compile(
+    r"(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})"
+)
+# 単一タイムスタンプ (HH:MM:SS,mmm) の各フィールド
+SRT_TIMESTAMP_PATTERN = re.compile(r"(\d+):(\d{2}):(\d{2}),(\d{3})")
+
+
+@dataclass
+class SrtTable:
+    """パース済みSRTエントリ（属性ごとの列で保持）"""
+
+    indices: np.ndarray  # エントリ番号 (int64)
+    starts: np.ndarray  # 開始時刻[秒] (float64)
+    ends: np.ndarray  # 終了時刻[秒] (float64)
+    durations: np.ndarray  # 表示時間[秒] (float64)
+    texts: List[str] = field(default_factory=list)
+    lines: List[List[str]] = field(default_factory=list)  # テキストの行分割
+
+    def __len__(self) -> int:
+        return len(self.texts)
 
 
 # SRTエントリのパース用
-def parse_srt_file(srt_path: str) -> List[Dict[str, Any]]:
-    """SRTファイルをパースしてエントリリストを返す"""
+def parse_srt_file(srt_path: str) -> SrtTable:
+    """SRTファイルをパースしてエントリの列データを返す"""
+    indices = []
+    starts = []
+    ends = []
+    texts = []
+    text_lines = []
+
+    def add_block(block: List[str]) -> None:
+        entry = _block_to_entry(block)
+        if entry is not None:
+            index, start_time, end_time, text, lines = entry
+            indices.append(index)
+            starts.append(start_time)
+            ends.append(end_time)
+            texts.append(text)
+            text_lines.append(lines)
+
+    # ファイル全体を読み込まず、1行ずつ読んで空行ごとにブロックを確定する
+    block = []
     with open(srt_path, "r", encoding="utf-8") as f:
-        content = f.read()
+        for line in f:
+            line = line.rstrip("\n")
+            if line:
+                block.append(line)
+                continue
+            if block:
+                add_block(block)
+                block = []
+
+    if block:
+        add_block(block)
+
+    starts_array = np.asarray(starts, dtype=np.float64)
+    ends_array = np.asarray(ends, dtype=np.float64)
+    return SrtTable(
+        indices=np.asarray(indices, dtype=np.int64),
+        starts=starts_array,
+        ends=ends_array,
+        durations=ends_array - starts_array,
+        texts=texts,
+        lines=text_lines,
+    )
 
-    entries = []
-    blocks = content.strip().split("\n\n")
 
-    for block in blocks:
-        lines = block.strip().split("\n")
-        if len(lines) < 3:
-            continue
+def _block_to_entry(
+    block: List[str],
+) -> Optional[Tuple[int, float, float, str, List[str]]]:
+    """SRTブロック（空行で区切られた行リスト）を (番号, 開始, 終了, テキスト, テキスト行) に変換する"""
+    lines = "\n".join(block).strip().split("\n")
+    if len(lines) < 3:
+        return None
 
-        index = int(lines[0])
-        time_line = lines[1]
-        text = "\n".join(lines[2:])
+    index = int(lines[0])
+    time_line = lines[1]
+    text_lines = lines[2:]
+    text = "\n".join(text_lines)
 
-        # タイムスタンプ解析
-        time_match = re.match(
-            r"(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})", time_line
-        )
-        if time_match:
-            start_time_str = time_match.group(1)
-            end_time_str = time_match.group(2)
-
-            # 秒に変換
-            start_time = parse_srt_time(start_time_str)
-            end_time = parse_srt_time(end_time_str)
-
-            entries.append(
-                {
-                    "index": index,
-                    "start_time": start_time,
-                    "end_time": end_time,
-                    "start_time_str": start_time_str,
-                    "end_time_str": end_time_str,
-                    "text": text,
-                    "duration": end_time - start_time,
-                }
-            )
+    # タイムスタンプ解析
+    time_match = SRT_TIME_PATTERN.match(time_line)
+    if not time_match:
+        return None
 
-    return entries
+    # 秒に変換
+    start_time = parse_srt_time(time_match.group(1))
+    end_time = parse_srt_time(time_match.group(2))
+
+    return index, start_time, end_time, text, text_lines
 
 
 def parse_srt_time(time_str: str) -> float:
     """SRTタイムフォーマット (HH:MM:SS,mmm) を秒に変換"""
-    time_str = time_str.replace(",", ".")
-    parts = time_str.split(":")
-    hours = int(parts[0])
-    minutes = int(parts[1])
-    seconds = float(parts[2])
+    if len(time_str) == 12:
+        # 固定幅の場合は正規表現を通さず、各桁を文字コードから直接計算する
+        total_ms = (
+            ((ord(time_str[0]) - 48) * 10 + ord(time_str[1]) - 48) * 3600000
+            + ((ord(time_str[3]) - 48) * 10 + ord(time_str[4]) - 48) * 60000
+            + ((ord(time_str[6]) - 48) * 10 + ord(time_str[7]) - 48) * 1000
+            + (ord(time_str[9]) - 48) * 100
+            + (ord(time_str[10]) - 48) * 10
+            + ord(time_str[11])
+            - 48
+        )
+        return total_ms / 1000
 
-    return hours * 3600 + minutes * 60 + seconds
+    hours, minutes, seconds, milliseconds = map(
+        int, SRT_TIMESTAMP_PATTERN.match(time_str).groups()
+    )
+    # 整数のミリ秒に揃えてから1回だけ除算する（丸め誤差を1回に抑える）
+    total_ms = ((hours * 60 + minutes) * 60 + seconds) * 1000 + milliseconds
+    return total_ms / 1000
+
+
+def _scan_entries(entries: SrtTable) -> Dict[str, Any]:
+    """
+    全エントリを1回だけ走査し、Test 1/Test 2で使う行単位・エントリ単位の集計を返す
+
+    - line_lengths: 全行の文字数 (int32)
+    - line_owners: 各行の (エントリ番号, 行番号, 行テキスト)
+    - entry_lines: エントリごとの行数 (int32)
+    """
+    line_lengths = []
+    line_owners = []
+    entry_lines = []
+    for entry_index, lines in zip(entries.indices.tolist(), entries.lines):
+        for line_num, line in enumerate(lines, 1):
+            line_lengths.append(len(line))
+            line_owners.append((entry_index, line_num, line))
+        entry_lines.append(len(lines))
+
+    return {
+        "line_lengths": np.asarray(line_lengths, dtype=np.int32),
+        "line_owners": line_owners,
+        "entry_lines": np.asarray(entry_lines, dtype=np.int32),
+    }
 
 
 def test_max_chars_constraint(
-    entries: List[Dict[str, Any]], max_chars: int = 26
+    entries: SrtTable, max_chars: int = 26, scan: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Test 1: MAX_CHARS制約の検証
@@ -85,131 +172,127 @@ def test_max_chars_constraint(
     検証内容:
     - 全エントリが max_chars 以下であること
     - 改行を含む場合、各行が max_chars 以下であること
-    """
-    print("=" * 80)
-    print("Test 1: MAX_CHARS制約の検証")
-    print("=" * 80)
 
-    violations = []
-    line_violations = []
+    scanに_scan_entries()の結果を渡すと、エントリの再走査を省略する
+    """
+    # 出力は1つのバッファにまとめ、最後に1回だけ書き出す
+    out = ["=" * 80, "Test 1: MAX_CHARS制約の検証", "=" * 80]
 
-    for entry in entries:
-        text = entry["text"]
-        text_length = len(text)
+    if scan is None:
+        scan = _scan_entries(entries)
 
-        # 改行を含む場合、各行をチェック
-        lines = text.split("\n")
-        for line_num, line in enumerate(lines, 1):
-            line_length = len(line)
-            if line_length > max_chars:
-                line_violations.append(
-                    {
-                        "entry_index": entry["index"],
-                        "line_num": line_num,
-                        "line": line,
-                        "length": line_length,
-                        "excess": line_length - max_chars,
-                    }
-                )
-
-        # 全体の文字数チェック（改行を除く）
-        text_no_newline = text.replace("\n", "")
-        if len(text_no_newline) > max_chars * len(lines):
-            violations.append(
-                {
-                    "entry_index": entry["index"],
-                    "text": text,
-                    "length": text_length,
-                    "lines": len(lines),
-                }
-            )
+    # 改行を含む場合、各行をチェック（違反は件数を数え、詳細は表示する先頭5件だけ作る）
+    line_lengths = scan["line_lengths"]
+    line_owners = scan["line_owners"]
+    violation_rows = np.flatnonzero(line_lengths > max_chars)
+    num_violations = len(violation_rows)
+    line_violations = []
+    for i in violation_rows[:5]:
+        entry_index, line_num, line = line_owners[i]
+        line_length = int(line_lengths[i])
+        line_violations.append(
+            {
+                "entry_index": entry_index,
+                "line_num": line_num,
+                "line": line,
+                "length": line_length,
+                "excess": line_length - max_chars,
+            }
+        )
 
     # 結果表示
-    print(f"📊 総エントリ数: {len(entries)}")
-    print(f"✅ MAX_CHARS制約を満たすエントリ: {len(entries) - len(line_violations)}")
-    print(f"❌ MAX_CHARS制約違反: {len(line_violations)} 行")
+    out.append(f"📊 総エントリ数: {len(entries)}")
+    out.append(f"✅ MAX_CHARS制約を満たすエントリ: {len(entries) - num_violations}")
+    out.append(f"❌ MAX_CHARS制約違反: {num_violations} 行")
 
     if line_violations:
-        print("\n❌ 制約違反の詳細:")
-        for i, violation in enumerate(line_violations[:5], 1):
-            print(f"\n  違反 {i}:")
-            print(f"    Entry: {violation['entry_index']}")
-            print(f"    行番号: {violation['line_num']}")
-            print(
+        out.append("\n❌ 制約違反の詳細:")
+        for i, violation in enumerate(line_violations, 1):
+            out.append(f"\n  違反 {i}:")
+            out.append(f"    Entry: {violation['entry_index']}")
+            out.append(f"    行番号: {violation['line_num']}")
+            out.append(
                 f"    文字数: {violation['length']} (超過: {violation['excess']}文字)"
             )
-            print(f"    テキスト: {violation['line']}")
+            out.append(f"    テキスト: {violation['line']}")
 
-        if len(line_violations) > 5:
-            print(f"\n  ...他 {len(line_violations) - 5} 件の違反")
+        if num_violations > 5:
+            out.append(f"\n  ...他 {num_violations - 5} 件の違反")
     else:
-        print("✅ すべてのエントリがMAX_CHARS制約を満たしています")
+        out.append("✅ すべてのエントリがMAX_CHARS制約を満たしています")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
     return {
-        "passed": len(line_violations) == 0,
+        "passed": num_violations == 0,
         "total_entries": len(entries),
-        "violations": len(line_violations),
+        "violations": num_violations,
         "details": line_violations,
     }
 
 
 def test_max_lines_constraint(
-    entries: List[Dict[str, Any]], max_lines: int = 2
+    entries: SrtTable, max_lines: int = 2, scan: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Test 2: MAX_LINES制約の検証
 
     検証内容:
     - 全エントリが max_lines 行以下であること
-    """
-    print("\n" + "=" * 80)
-    print("Test 2: MAX_LINES制約の検証")
-    print("=" * 80)
 
-    violations = []
-
-    for entry in entries:
-        text = entry["text"]
-        lines = text.split("\n")
-        num_lines = len(lines)
-
-        if num_lines > max_lines:
-            violations.append(
-                {
-                    "entry_index": entry["index"],
-                    "text": text,
-                    "num_lines": num_lines,
-                    "excess": num_lines - max_lines,
-                }
-            )
+    scanに_scan_entries()の結果を渡すと、エントリの再走査を省略する
+    """
+    # 出力は1つのバッファにまとめ、最後に1回だけ書き出す
+    out = ["\n" + "=" * 80, "Test 2: MAX_LINES制約の検証", "=" * 80]
+
+    if scan is None:
+        scan = _scan_entries(entries)
+
+    # 違反は件数を数え、詳細は表示する先頭5件だけ作る
+    entry_lines = scan["entry_lines"]
+    violation_rows = np.flatnonzero(entry_lines > max_lines)
+    num_violations = len(violation_rows)
+    violations = [
+        {
+            "entry_index": int(entries.indices[i]),
+            "text": entries.texts[i],
+            "num_lines": int(entry_lines[i]),
+            "excess": int(entry_lines[i]) - max_lines,
+        }
+        for i in violation_rows[:5]
+    ]
 
     # 結果表示
-    print(f"📊 総エントリ数: {len(entries)}")
-    print(f"✅ MAX_LINES制約を満たすエントリ: {len(entries) - len(violations)}")
-    print(f"❌ MAX_LINES制約違反: {len(violations)} エントリ")
+    out.append(f"📊 総エントリ数: {len(entries)}")
+    out.append(f"✅ MAX_LINES制約を満たすエントリ: {len(entries) - num_violations}")
+    out.append(f"❌ MAX_LINES制約違反: {num_violations} エントリ")
 
     if violations:
-        print("\n❌ 制約違反の詳細:")
-        for i, violation in enumerate(violations[:5], 1):
-            print(f"\n  違反 {i}:")
-            print(f"    Entry: {violation['entry_index']}")
-            print(f"    行数: {violation['num_lines']} (超過: {violation['excess']}行)")
-            print(f"    テキスト: {violation['text']}")
-
-        if len(violations) > 5:
-            print(f"\n  ...他 {len(violations) - 5} 件の違反")
+        out.append("\n❌ 制約違反の詳細:")
+        for i, violation in enumerate(violations, 1):
+            out.append(f"\n  違反 {i}:")
+            out.append(f"    Entry: {violation['entry_index']}")
+            out.append(
+                f"    行数: {violation['num_lines']} (超過: {violation['excess']}行)"
+            )
+            out.append(f"    テキスト: {violation['text']}")
+
+        if num_violations > 5:
+            out.append(f"\n  ...他 {num_violations - 5} 件の違反")
     else:
-        print("✅ すべてのエントリがMAX_LINES制約を満たしています")
+        out.append("✅ すべてのエントリがMAX_LINES制約を満たしています")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
     return {
-        "passed": len(violations) == 0,
+        "passed": num_violations == 0,
         "total_entries": len(entries),
-        "violations": len(violations),
+        "violations": num_violations,
         "details": violations,
     }
 
 
-def test_timing_accuracy(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+def test_timing_accuracy(entries: SrtTable) -> Dict[str, Any]:
     """
     Test 3: タイミング精度の検証
 
@@ -217,90 +300,61 @@ def test_timing_accuracy(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
     - 連続する字幕の時間軸が途切れていないこと
     - 各エントリの duration > 0 であること
     """
-    print("\n" + "=" * 80)
-    print("Test 3: タイミング精度の検証")
-    print("=" * 80)
-
-    gaps = []
-    overlaps = []
-    zero_durations = []
-
-    for i in range(len(entries) - 1):
-        current = entries[i]
-        next_entry = entries[i + 1]
-
-        # duration チェック
-        if current["duration"] <= 0:
-            zero_durations.append(
-                {"entry_index": current["index"], "duration": current["duration"]}
-            )
-
-        # 時間軸の連続性チェック
-        gap = next_entry["start_time"] - current["end_time"]
-
-        if abs(gap) > 0.001:  # 1ms以上の差異
-            if gap > 0:
-                gaps.append(
-                    {
-                        "between": f"{current['index']} - {next_entry['index']}",
-                        "gap": gap,
-                        "current_end": current["end_time"],
-                        "next_start": next_entry["start_time"],
-                    }
-                )
-            else:
-                overlaps.append(
-                    {
-                        "between": f"{current['index']} - {next_entry['index']}",
-                        "overlap": -gap,
-                        "current_end": current["end_time"],
-                        "next_start": next_entry["start_time"],
-                    }
-                )
-
-    # 最後のエントリのdurationチェック
-    if entries:
-        last = entries[-1]
-        if last["duration"] <= 0:
-            zero_durations.append(
-                {"entry_index": last["index"], "duration": last["duration"]}
-            )
+    # 出力は1つのバッファにまとめ、最後に1回だけ書き出す
+    out = ["\n" + "=" * 80, "Test 3: タイミング精度の検証", "=" * 80]
+
+    # 連続する字幕間の差分を列データから一括で計算する
+    indices = entries.indices
+    starts = entries.starts
+    ends = entries.ends
+    durations = entries.durations
+    diffs = starts[1:] - ends[:-1]
+
+    # 該当箇所は件数だけ数え、詳細は表示する上位5件だけ作る
+    zero_rows = np.flatnonzero(durations <= 0)
+    gap_rows = np.flatnonzero(diffs > 0.001)  # 1ms以上の差異のみ
+    overlap_rows = np.flatnonzero(diffs < -0.001)
+    num_zero_durations = len(zero_rows)
+    num_gaps = len(gap_rows)
+    num_overlaps = len(overlap_rows)
 
     # 結果表示
-    print(f"📊 総エントリ数: {len(entries)}")
-    print(f"✅ 正常なdurationを持つエントリ: {len(entries) - len(zero_durations)}")
-    print(f"❌ duration=0のエントリ: {len(zero_durations)}")
-    print(f"⚠️  時間軸のギャップ: {len(gaps)}")
-    print(f"⚠️  時間軸の重複: {len(overlaps)}")
-
-    if zero_durations:
-        print("\n❌ duration=0のエントリ:")
-        for item in zero_durations[:5]:
-            print(f"  Entry {item['entry_index']}: duration={item['duration']:.3f}秒")
-
-    if gaps:
-        print("\n⚠️  時間軸のギャップ（上位5件）:")
-        for item in sorted(gaps, key=lambda x: x["gap"], reverse=True)[:5]:
-            print(f"  {item['between']}: ギャップ={item['gap']:.3f}秒")
-
-    if overlaps:
-        print("\n⚠️  時間軸の重複（上位5件）:")
-        for item in sorted(overlaps, key=lambda x: x["overlap"], reverse=True)[:5]:
-            print(f"  {item['between']}: 重複={item['overlap']:.3f}秒")
-
-    all_passed = len(zero_durations) == 0 and len(gaps) == 0 and len(overlaps) == 0
+    out.append(f"📊 総エントリ数: {len(entries)}")
+    out.append(f"✅ 正常なdurationを持つエントリ: {len(entries) - num_zero_durations}")
+    out.append(f"❌ duration=0のエントリ: {num_zero_durations}")
+    out.append(f"⚠️  時間軸のギャップ: {num_gaps}")
+    out.append(f"⚠️  時間軸の重複: {num_overlaps}")
+
+    if num_zero_durations:
+        out.append("\n❌ duration=0のエントリ:")
+        for i in zero_rows[:5]:
+            out.append(f"  Entry {indices[i]}: duration={durations[i]:.3f}秒")
+
+    if num_gaps:
+        out.append("\n⚠️  時間軸のギャップ（上位5件）:")
+        for i in heapq.nlargest(5, gap_rows.tolist(), key=diffs.__getitem__):
+            out.append(f"  {indices[i]} - {indices[i + 1]}: ギャップ={diffs[i]:.3f}秒")
+
+    if num_overlaps:
+        out.append("\n⚠️  時間軸の重複（上位5件）:")
+        for i in heapq.nsmallest(5, overlap_rows.tolist(), key=diffs.__getitem__):
+            out.append(f"  {indices[i]} - {indices[i + 1]}: 重複={-diffs[i]:.3f}秒")
+
+    all_passed = num_zero_durations == 0 and num_gaps == 0 and num_overlaps == 0
     if all_passed:
-        print("\n✅ すべてのエントリが正確なタイミングを持っています")
+        out.append("\n✅ すべてのエントリが正確なタイミングを持っています")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
     return {
         "passed": all_passed,
-        "zero_durations": len(zero_durations),
-        "gaps": len(gaps),
-        "overlaps": len(overlaps),
+        "zero_durations": num_zero_durations,
+        "gaps": num_gaps,
+        "overlaps": num_overlaps,
     }
 
 
-def compare_srt_files(old_srt_path: str, new_srt_path: str) -> Dict[str, Any]:
+def compare_srt_files(old_srt_path: str, new_entries: SrtTable) -> Dict[str, Any]:
     """
     Test 4: 既存SRTファイルとの比較分析
 
@@ -308,6 +362,8 @@ def compare_srt_files(old_srt_path: str, new_srt_path: str) -> Dict[str, Any]:
     - エントリ数の変化
     - 総時間の一致
     - 分割パターンの変化
+
+    new_entriesには読み込み済みの新しいSRTを渡す（再パースしない）
     """
     print("\n" + "=" * 80)
     print("Test 4: 既存SRTファイルとの比較分析")
@@ -318,11 +374,10 @@ def compare_srt_files(old_srt_path: str, new_srt_path: str) -> Dict[str, Any]:
         return {"skipped": True}
 
     old_entries = parse_srt_file(old_srt_path)
-    new_entries = parse_srt_file(new_srt_path)
 
     # 総時間計算
-    old_total_time = old_entries[-1]["end_time"] if old_entries else 0
-    new_total_time = new_entries[-1]["end_time"] if new_entries else 0
+    old_total_time = float(old_entries.ends[-1]) if old_entries else 0
+    new_total_time = float(new_entries.ends[-1]) if new_entries else 0
 
     # 統計情報
     print("\n📊 エントリ数:")
@@ -338,20 +393,24 @@ def compare_srt_files(old_srt_path: str, new_srt_path: str) -> Dict[str, Any]:
     print(f"  差分: {abs(new_total_time - old_total_time):.3f}秒")
 
     # 文字数統計
-    old_char_lengths = [len(e["text"]) for e in old_entries]
-    new_char_lengths = [len(e["text"]) for e in new_entries]
+    old_char_lengths = np.fromiter(
+        map(len, old_entries.texts), dtype=np.int32, count=len(old_entries)
+    )
+    new_char_lengths = np.fromiter(
+        map(len, new_entries.texts), dtype=np.int32, count=len(new_entries)
+    )
 
     print("\n📏 文字数統計:")
     print(
-        f"  既存: 平均={sum(old_char_lengths) / len(old_char_lengths):.1f}文字, 最大={max(old_char_lengths)}文字"
+        f"  既存: 平均={old_char_lengths.mean():.1f}文字, 最大={old_char_lengths.max()}文字"
     )
     print(
-        f"  新規: 平均={sum(new_char_lengths) / len(new_char_lengths):.1f}文字, 最大={max(new_char_lengths)}文字"
+        f"  新規: 平均={new_char_lengths.mean():.1f}文字, 最大={new_char_lengths.max()}文字"
     )
 
     # MAX_CHARS違反のカウント
-    old_violations = sum(1 for length in old_char_lengths if length > 26)
-    new_violations = sum(1 for length in new_char_lengths if length > 26)
+    old_violations = int(np.count_nonzero(old_char_lengths > 26))
+    new_violations = int(np.count_nonzero(new_char_lengths > 26))
 
     print("\n✂️  分割状況:")
     print(
@@ -383,7 +442,8 @@ def generate_test_report(
 ) -> None:
     """テスト結果レポートを生成"""
 
-    report = f"""# VOICEVOX SRT Generator v4 - テスト結果レポート
+    # 文字列の逐次連結を避け、部品をリストに集めて最後に1回だけ結合する
+    parts = [f"""# VOICEVOX SRT Generator v4 - テスト結果レポート
 
 ## テスト概要
 
@@ -398,20 +458,20 @@ def generate_test_report(
 - 違反数: {test1_result["violations"]}
 - **結果**: {"✅ PASSED" if test1_result["passed"] else "❌ FAILED"}
 
-"""
+"""]
 
     if not test1_result["passed"] and test1_result["details"]:
-        report += "### 違反詳細（上位5件）\n\n"
+        parts.append("### 違反詳細（上位5件）\n\n")
         for i, violation in enumerate(test1_result["details"][:5], 1):
-            report += f"**違反 {i}**:\n"
-            report += f"- Entry: {violation['entry_index']}\n"
-            report += f"- 行番号: {violation['line_num']}\n"
-            report += (
+            parts.append(f"**違反 {i}**:\n")
+            parts.append(f"- Entry: {violation['entry_index']}\n")
+            parts.append(f"- 行番号: {violation['line_num']}\n")
+            parts.append(
                 f"- 文字数: {violation['length']} (超過: {violation['excess']}文字)\n"
             )
-            report += f"- テキスト: {violation['line']}\n\n"
+            parts.append(f"- テキスト: {violation['line']}\n\n")
 
-    report += f"""
+    parts.append(f"""
 ## Test 2: MAX_LINES制約の検証
 
 **目的**: 全エントリが2行制限を満たしているか確認
@@ -421,9 +481,9 @@ def generate_test_report(
 - 違反数: {test2_result["violations"]}
 - **結果**: {"✅ PASSED" if test2_result["passed"] else "❌ FAILED"}
 
-"""
+""")
 
-    report += f"""
+    parts.append(f"""
 ## Test 3: タイミング精度の検証
 
 **目的**: 字幕と音声のタイミングが正確に同期しているか確認
@@ -433,10 +493,10 @@ def generate_test_report(
 - 時間軸の重複: {test3_result["overlaps"]}
 - **結果**: {"✅ PASSED" if test3_result["passed"] else "❌ FAILED"}
 
-"""
+""")
 
     if not test4_result.get("skipped"):
-        report += f"""
+        parts.append(f"""
 ## Test 4: 既存SRTファイルとの比較
 
 **目的**: 既存実装との互換性とデグレッション確認
@@ -456,36 +516,40 @@ def generate_test_report(
 - 既存: {test4_result["old_violations"]} エントリ ({test4_result["old_violations"] / test4_result["old_entries"] * 100:.1f}%)
 - 新規: {test4_result["new_violations"]} エントリ ({test4_result["new_violations"] / test4_result["new_entries"] * 100:.1f}%)
 
-"""
+""")
     else:
-        report += "\n## Test 4: 既存SRTファイルとの比較\n\n⚠️  既存SRTファイルが見つからないため、スキップされました。\n\n"
+        parts.append(
+            "\n## Test 4: 既存SRTファイルとの比較\n\n⚠️  既存SRTファイルが見つからないため、スキップされました。\n\n"
+        )
 
     # 総合判定
     all_passed = (
         test1_result["passed"] and test2_result["passed"] and test3_result["passed"]
     )
 
-    report += """
+    parts.append("""
 ## 総合判定
 
-"""
+""")
 
     if all_passed:
-        report += "### ✅ ALL TESTS PASSED\n\n"
-        report += "すべてのテストに合格しました。voicevox_srt_generator_v4_fixed.py は期待通りに動作しています。\n\n"
-        report += "**確認事項**:\n"
-        report += "- MAX_CHARS制約（26文字制限）が正しく機能しています\n"
-        report += "- MAX_LINES制約（2行制限）が正しく機能しています\n"
-        report += "- 字幕と音声のタイミングが正確に同期しています\n"
+        parts.append("### ✅ ALL TESTS PASSED\n\n")
+        parts.append(
+            "すべてのテストに合格しました。voicevox_srt_generator_v4_fixed.py は期待通りに動作しています。\n\n"
+        )
+        parts.append("**確認事項**:\n")
+        parts.append("- MAX_CHARS制約（26文字制限）が正しく機能しています\n")
+        parts.append("- MAX_LINES制約（2行制限）が正しく機能しています\n")
+        parts.append("- 字幕と音声のタイミングが正確に同期しています\n")
     else:
-        report += "### ❌ SOME TESTS FAILED\n\n"
-        report += (
+        parts.append("### ❌ SOME TESTS FAILED\n\n")
+        parts.append(
             "一部のテストが失敗しました。詳細は上記の各テスト結果を確認してください。\n"
         )
 
     # ファイル出力
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(report)
+    report = "".join(parts)
+    Path(output_path).write_text(report, encoding="utf-8")
 
     print(f"\n📄 テストレポートを生成しました: {output_path}")
 
@@ -515,13 +579,14 @@ def main():
     # SRTファイル読み込み
     new_entries = parse_srt_file(new_srt_path)
 
-    # テスト実行
-    test1_result = test_max_chars_constraint(new_entries, max_chars=26)
-    test2_result = test_max_lines_constraint(new_entries, max_lines=2)
+    # テスト実行（Test 1/Test 2の集計は1回の走査で共有する）
+    scan = _scan_entries(new_entries)
+    test1_result = test_max_chars_constraint(new_entries, max_chars=26, scan=scan)
+    test2_result = test_max_lines_constraint(new_entries, max_lines=2, scan=scan)
     test3_result = test_timing_accuracy(new_entries)
 
     if old_srt_path:
-        test4_result = compare_srt_files(old_srt_path, new_srt_path)
+        test4_result = compare_srt_files(old_srt_path, new_entries)
     else:
         test4_result = {"skipped": True}
 
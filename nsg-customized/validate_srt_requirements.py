@@ -6,11 +6,79 @@ validate_srt_requirements.py
 MAX_CHARS/MAX_LINES制限の詳細チェック
 """
 
-import re
 import sys
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import List, Optional
 import importlib.util
 
+# 感情表現とみなす行末記号（これらが2文字以上連続する行を感情表現とする）
+EMOTION_CHARS = '。！？、…・ー～'
+
+# レポートで違反・許容事例ごとに繰り返し出力する行の書式
+CHARS_VIOLATION_FORMAT = "  エントリ#{} 行{}: {}文字 > {}文字\n    テキスト: '{}'"
+LINES_VIOLATION_FORMAT = "  エントリ#{}: {}行 > {}行\n    テキスト: '{}'"
+PUNCT_VIOLATION_FORMAT = "  エントリ#{} 行{}: '{}'"
+EMOTION_ALLOWANCE_FORMAT = "  エントリ#{}: {}文字\n    テキスト: '{}'"
+EMOTION_ANALYSIS_FORMAT = "    基本部分: '{base_text}' ({base_length}文字)\n    感情部分: '{emotion_part}' ({emotion_length}文字)"
+MORE_VIOLATIONS_FORMAT = "    ... 他{}件"
+
+@dataclass(slots=True)
+class CharsViolation:
+    """MAX_CHARS制限の違反（1行分）"""
+    index: int
+    line: int
+    expected: int
+    actual: int
+    text: str
+    emotion_analysis: Optional[dict] = None
+
+@dataclass(slots=True)
+class LinesViolation:
+    """MAX_LINES制限の違反（1エントリ分）"""
+    index: int
+    expected: int
+    actual: int
+    text: str
+
+@dataclass(slots=True)
+class PunctViolation:
+    """意味のない句読点だけの行"""
+    index: int
+    line: int
+    text: str
+
+@dataclass(slots=True)
+class EmotionAllowance:
+    """感情表現により文字数超過が許容された行"""
+    index: int
+    line: int
+    char_count: int
+    text: str
+    emotion_analysis: dict
+
+@dataclass(slots=True)
+class ScanResult:
+    """scan_srt()の結果（違反は種類ごとのリストと件数で保持）"""
+    stats: dict
+    char_violations: List[CharsViolation]
+    line_violations: List[LinesViolation]
+    punct_violations: List[PunctViolation]
+    emotion_allowances: List[EmotionAllowance]
+    char_violation_count: int
+    line_violation_count: int
+    punct_violation_count: int
+    emotion_allowance_count: int
+    
+    @property
+    def violation_count(self) -> int:
+        return self.char_violation_count + self.line_violation_count + self.punct_violation_count
+    
+    def violations(self) -> list:
+        """全種類の違反をまとめたリスト"""
+        return self.line_violations + self.char_violations + self.punct_violations
+
 def load_module_from_path(module_name: str, file_path: str):
     """指定パスからモジュールを動的インポート"""
     spec = importlib.util.spec_from_file_location(module_name, file_path)
@@ -18,174 +86,174 @@ def load_module_from_path(module_name: str, file_path: str):
     spec.loader.exec_module(module)
     return module
 
-def parse_srt_file(srt_path: str):
-    """SRTファイルを解析"""
-    with open(srt_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # SRTエントリを分割
-    entries = []
-    blocks = content.strip().split('\n\n')
+def count_trailing_emotion_chars(line: str) -> int:
+    """行末に連続する感情表現記号の文字数を返す"""
+    # 行末の記号除去はC実装のrstripに任せ、除去された文字数を数える
+    return len(line) - len(line.rstrip(EMOTION_CHARS))
+
+def _parse_srt_block(block):
+    """SRTブロック（空行で区切られた行リスト）をエントリに変換（3行未満ならNone）"""
+    lines = '\n'.join(block).strip().split('\n')
+    if len(lines) < 3:
+        return None
     
-    for block in blocks:
-        if not block.strip():
-            continue
-        
-        lines = block.strip().split('\n')
-        if len(lines) >= 3:
-            index = int(lines[0])
-            time_range = lines[1]
-            text_lines = lines[2:]
-            text = '\n'.join(text_lines)
-            
-            entries.append({
-                'index': index,
-                'time_range': time_range,
-                'text': text,
-                'lines': text_lines
-            })
+    # 検証に使うのは番号とテキスト行だけ（タイムスタンプ行は保持しない）
+    # テキストは行リストだけで保持（連結文字列は必要になった時に作る）
+    return {
+        'index': int(lines[0]),
+        'lines': lines[2:]
+    }
+
+def iter_srt_entries(srt_path: str):
+    """SRTファイルを1行ずつ読み、エントリを1件ずつ返すジェネレータ"""
+    block = []
+    # 改行コードの変換層を通さず（newline=''）、行末の\r\nは自前で取り除く
+    with open(srt_path, 'r', encoding='utf-8', buffering=1 << 20, newline='') as f:
+        for line in f:
+            line = line.rstrip('\r\n')
+            if line:
+                block.append(line)
+                continue
+            # 空行でブロックを確定
+            if block:
+                entry = _parse_srt_block(block)
+                if entry is not None:
+                    yield entry
+                block = []
     
-    return entries
+    if block:
+        entry = _parse_srt_block(block)
+        if entry is not None:
+            yield entry
 
-def validate_with_emotion_support(entries, max_chars=26, max_lines=2):
-    """感情表現対応の要件検証"""
+def parse_srt_file(srt_path: str):
+    """SRTファイルを解析"""
+    return list(iter_srt_entries(srt_path))
+
+@lru_cache(maxsize=1)
+def _load_emotion_handler():
+    """
+    gen-srt-from-vvproj.pyを動的インポートして感情表現ハンドラーを返す（見つからなければNone）
     
-    # gen-srt-from-vvproj.pyを動的インポート
+    モジュールの実行とハンドラー生成は初回のみで、以降は同じハンドラーを返す
+    """
     gen_srt_path = Path(__file__).parent / "gen-srt-from-vvproj.py"
-    if not gen_srt_path.exists():
-        print(f"Warning: gen-srt-from-vvproj.py not found. Using basic validation.")
-        return validate_basic(entries, max_chars, max_lines)
-    
-    gen_srt_module = load_module_from_path("gen_srt_from_vvproj", str(gen_srt_path))
-    emotion_handler = gen_srt_module.EmotionalExpressionHandler()
+    try:
+        gen_srt_module = load_module_from_path("gen_srt_from_vvproj", str(gen_srt_path))
+    except FileNotFoundError:
+        return None
+    return gen_srt_module.EmotionalExpressionHandler()
+
+def scan_srt(entries, emotion_handler=None, max_chars=26, max_lines=2, max_records=None):
+    """
+    統計情報の集計と要件検証を1回の走査でまとめて行う
     
-    violations = []
+    emotion_handlerがNoneの場合は基本的な要件検証（感情表現サポートなし）を行う。
+    entriesは1回だけ走査するので、iter_srt_entries()のイテレータをそのまま渡せる。
+    違反は種類ごとのリストに直接振り分けてScanResultで返す。
+    max_recordsを指定すると、各リストには先頭max_records件だけを保持する（件数は全件数える）
+    """
+    keep = sys.maxsize if max_records is None else max_records
+    char_violations = []
+    line_violations = []
+    punct_violations = []
     emotion_allowances = []
+    char_violation_count = 0
+    line_violation_count = 0
+    punct_violation_count = 0
+    emotion_allowance_count = 0
+    
+    total_entries = 0
+    total_chars = 0
+    total_lines = 0
+    max_chars_per_line = 0
+    max_lines_per_entry = 0
+    emotion_expressions = 0
     
     for entry in entries:
         text_lines = entry['lines']
+        line_count = len(text_lines)
+        total_entries += 1
+        total_lines += line_count
+        if line_count > max_lines_per_entry:
+            max_lines_per_entry = line_count
         
         # 行数チェック
-        if len(text_lines) > max_lines:
-            violations.append({
-                'index': entry['index'],
-                'type': 'MAX_LINES_VIOLATION',
-                'expected': max_lines,
-                'actual': len(text_lines),
-                'text': entry['text']
-            })
+        if line_count > max_lines:
+            line_violation_count += 1
+            if line_violation_count <= keep:
+                line_violations.append(LinesViolation(
+                    entry['index'], max_lines, line_count, '\n'.join(text_lines)))
         
-        # 各行の文字数チェック（感情表現考慮）
+        # 各行の文字数チェック（ハンドラーがあれば感情表現を考慮）
         for line_num, line in enumerate(text_lines, 1):
             char_count = len(line)
-            is_allowed = emotion_handler.is_chars_allowed_with_emotion(line, max_chars)
+            total_chars += char_count
+            if char_count > max_chars_per_line:
+                max_chars_per_line = char_count
+            
+            # 感情表現チェック
+            if count_trailing_emotion_chars(line) >= 2:
+                emotion_expressions += 1
+            
+            # 意味のない句読点チェック（ハンドラーがある場合のみ）
+            if emotion_handler is not None and emotion_handler.is_meaningless_punctuation(line):
+                punct_violation_count += 1
+                if punct_violation_count <= keep:
+                    punct_violations.append(PunctViolation(entry['index'], line_num, line))
             
-            if not is_allowed:
-                violations.append({
-                    'index': entry['index'],
-                    'type': 'MAX_CHARS_VIOLATION',
-                    'line': line_num,
-                    'expected': max_chars,
-                    'actual': char_count,
-                    'text': line,
-                    'emotion_analysis': emotion_handler.analyze_emotional_expression(line)
-                })
-            elif char_count > max_chars:
+            # max_chars以内の行は違反にも許容事例にもならないので、ハンドラーの判定を省略
+            if char_count <= max_chars:
+                continue
+            
+            if emotion_handler is None:
+                char_violation_count += 1
+                if char_violation_count <= keep:
+                    char_violations.append(CharsViolation(entry['index'], line_num, max_chars, char_count, line))
+            elif not emotion_handler.is_chars_allowed_with_emotion(line, max_chars):
+                char_violation_count += 1
+                if char_violation_count <= keep:
+                    char_violations.append(CharsViolation(
+                        entry['index'], line_num, max_chars, char_count, line,
+                        emotion_handler.analyze_emotional_expression(line)))
+            else:
                 # 感情表現による許容事例
-                emotion_allowances.append({
-                    'index': entry['index'],
-                    'line': line_num,
-                    'char_count': char_count,
-                    'text': line,
-                    'emotion_analysis': emotion_handler.analyze_emotional_expression(line)
-                })
-        
-        # 意味のない句読点チェック
-        for line_num, line in enumerate(text_lines, 1):
-            if emotion_handler.is_meaningless_punctuation(line):
-                violations.append({
-                    'index': entry['index'],
-                    'type': 'MEANINGLESS_PUNCTUATION',
-                    'line': line_num,
-                    'text': line
-                })
+                emotion_allowance_count += 1
+                if emotion_allowance_count <= keep:
+                    emotion_allowances.append(EmotionAllowance(
+                        entry['index'], line_num, char_count, line,
+                        emotion_handler.analyze_emotional_expression(line)))
+    
+    stats = {
+        'total_entries': total_entries,
+        'max_chars_per_line': max_chars_per_line,
+        'max_lines_per_entry': max_lines_per_entry,
+        'average_chars_per_line': total_chars / total_lines if total_lines > 0 else 0,
+        'average_lines_per_entry': total_lines / total_entries if total_entries > 0 else 0,
+        'emotion_expressions': emotion_expressions
+    }
+    
+    return ScanResult(
+        stats, char_violations, line_violations, punct_violations, emotion_allowances,
+        char_violation_count, line_violation_count, punct_violation_count, emotion_allowance_count)
+
+def validate_with_emotion_support(entries, max_chars=26, max_lines=2):
+    """感情表現対応の要件検証"""
+    emotion_handler = _load_emotion_handler()
+    if emotion_handler is None:
+        print(f"Warning: gen-srt-from-vvproj.py not found. Using basic validation.")
+        return validate_basic(entries, max_chars, max_lines)
     
-    return violations, emotion_allowances
+    result = scan_srt(entries, emotion_handler, max_chars, max_lines)
+    return result.violations(), result.emotion_allowances
 
 def validate_basic(entries, max_chars=26, max_lines=2):
     """基本的な要件検証（感情表現サポートなし）"""
-    violations = []
-    
-    for entry in entries:
-        text_lines = entry['lines']
-        
-        # 行数チェック
-        if len(text_lines) > max_lines:
-            violations.append({
-                'index': entry['index'],
-                'type': 'MAX_LINES_VIOLATION',
-                'expected': max_lines,
-                'actual': len(text_lines),
-                'text': entry['text']
-            })
-        
-        # 各行の文字数チェック
-        for line_num, line in enumerate(text_lines, 1):
-            char_count = len(line)
-            if char_count > max_chars:
-                violations.append({
-                    'index': entry['index'],
-                    'type': 'MAX_CHARS_VIOLATION',
-                    'line': line_num,
-                    'expected': max_chars,
-                    'actual': char_count,
-                    'text': line
-                })
-    
-    return violations, []
+    return scan_srt(entries, None, max_chars, max_lines).violations(), []
 
 def analyze_srt_statistics(entries):
     """SRTファイルの統計情報を分析"""
-    stats = {
-        'total_entries': len(entries),
-        'char_counts': [],
-        'line_counts': [],
-        'max_chars_per_line': 0,
-        'max_lines_per_entry': 0,
-        'average_chars_per_line': 0,
-        'average_lines_per_entry': 0,
-        'emotion_expressions': 0
-    }
-    
-    total_chars = 0
-    total_lines = 0
-    
-    # 感情表現パターン
-    emotion_pattern = r'[。！？、…・ー～]{2,}$'
-    
-    for entry in entries:
-        text_lines = entry['lines']
-        line_count = len(text_lines)
-        stats['line_counts'].append(line_count)
-        stats['max_lines_per_entry'] = max(stats['max_lines_per_entry'], line_count)
-        total_lines += line_count
-        
-        for line in text_lines:
-            char_count = len(line)
-            stats['char_counts'].append(char_count)
-            stats['max_chars_per_line'] = max(stats['max_chars_per_line'], char_count)
-            total_chars += char_count
-            
-            # 感情表現チェック
-            if re.search(emotion_pattern, line):
-                stats['emotion_expressions'] += 1
-    
-    if total_lines > 0:
-        stats['average_chars_per_line'] = total_chars / total_lines
-    if len(entries) > 0:
-        stats['average_lines_per_entry'] = total_lines / len(entries)
-    
-    return stats
+    return scan_srt(entries).stats
 
 def main():
     """メイン処理"""
@@ -195,108 +263,108 @@ def main():
     
     srt_path = sys.argv[1]
     
-    if not Path(srt_path).exists():
+    # 出力は1つのバッファにまとめ、最後に1回だけ書き出す
+    out = [
+        "=" * 70,
+        "🎮 NextStage Gaming チャンネル - SRT要件準拠検証",
+        "=" * 70,
+        f"SRTファイル: {srt_path}",
+        "",
+    ]
+    
+    # 統計情報の分析と要件検証をSRTファイルの1回の走査で行う（感情表現対応）
+    emotion_handler = _load_emotion_handler()
+    # 表示するのは各種類の先頭5件までなので、それ以上の詳細は保持しない
+    # 事前の存在確認はせず、開けなかった場合にエラーとする
+    try:
+        result = scan_srt(iter_srt_entries(srt_path), emotion_handler, max_chars=26, max_lines=2, max_records=5)
+    except FileNotFoundError:
         print(f"Error: SRT file not found: {srt_path}")
         sys.exit(1)
+    stats = result.stats
+    emotion_allowances = result.emotion_allowances
+    char_violations = result.char_violations
+    line_violations = result.line_violations
+    punct_violations = result.punct_violations
     
-    print("=" * 70)
-    print("🎮 NextStage Gaming チャンネル - SRT要件準拠検証")
-    print("=" * 70)
-    print(f"SRTファイル: {srt_path}")
-    print()
+    out.append("📊 統計情報")
+    out.append("-" * 20)
+    out.append(f"総エントリ数:        {stats['total_entries']}")
+    out.append(f"最大文字数/行:       {stats['max_chars_per_line']}")
+    out.append(f"最大行数/エントリ:   {stats['max_lines_per_entry']}")
+    out.append(f"平均文字数/行:       {stats['average_chars_per_line']:.1f}")
+    out.append(f"平均行数/エントリ:   {stats['average_lines_per_entry']:.1f}")
+    out.append(f"感情表現行数:        {stats['emotion_expressions']}")
+    out.append("")
     
-    # SRTファイルを解析
-    entries = parse_srt_file(srt_path)
+    if emotion_handler is None:
+        out.append(f"Warning: gen-srt-from-vvproj.py not found. Using basic validation.")
     
-    # 統計情報を分析
-    stats = analyze_srt_statistics(entries)
+    out.append("🎯 要件準拠検証")
+    out.append("-" * 20)
+    out.append(f"MAX_CHARS制限: 26文字/行（感情表現は例外許容）")
+    out.append(f"MAX_LINES制限: 2行/エントリ（厳密）")
+    out.append("")
     
-    print("📊 統計情報")
-    print("-" * 20)
-    print(f"総エントリ数:        {stats['total_entries']}")
-    print(f"最大文字数/行:       {stats['max_chars_per_line']}")
-    print(f"最大行数/エントリ:   {stats['max_lines_per_entry']}")
-    print(f"平均文字数/行:       {stats['average_chars_per_line']:.1f}")
-    print(f"平均行数/エントリ:   {stats['average_lines_per_entry']:.1f}")
-    print(f"感情表現行数:        {stats['emotion_expressions']}")
-    print()
-    
-    # 感情表現対応の要件検証
-    violations, emotion_allowances = validate_with_emotion_support(entries, max_chars=26, max_lines=2)
-    
-    print("🎯 要件準拠検証")
-    print("-" * 20)
-    print(f"MAX_CHARS制限: 26文字/行（感情表現は例外許容）")
-    print(f"MAX_LINES制限: 2行/エントリ（厳密）")
-    print()
-    
-    if not violations:
-        print("✅ 全ての要件に準拠しています！")
+    if not result.violation_count:
+        out.append("✅ 全ての要件に準拠しています！")
         
         if emotion_allowances:
-            print(f"🎭 感情表現による文字数許容: {len(emotion_allowances)}件")
-            print()
-            print("感情表現許容例:")
+            out.append(f"🎭 感情表現による文字数許容: {result.emotion_allowance_count}件")
+            out.append("")
+            out.append("感情表現許容例:")
             for allowance in emotion_allowances[:3]:  # 最初の3件を表示
-                analysis = allowance['emotion_analysis']
-                print(f"  エントリ#{allowance['index']}: {allowance['char_count']}文字")
-                print(f"    テキスト: '{allowance['text']}'")
-                print(f"    基本部分: '{analysis['base_text']}' ({analysis['base_length']}文字)")
-                print(f"    感情部分: '{analysis['emotion_part']}' ({analysis['emotion_length']}文字)")
-                print()
+                out.append(EMOTION_ALLOWANCE_FORMAT.format(allowance.index, allowance.char_count, allowance.text))
+                out.append(EMOTION_ANALYSIS_FORMAT.format_map(allowance.emotion_analysis))
+                out.append("")
     else:
-        print(f"⚠️  {len(violations)}個の違反が見つかりました:")
-        print()
-        
-        char_violations = [v for v in violations if v['type'] == 'MAX_CHARS_VIOLATION']
-        line_violations = [v for v in violations if v['type'] == 'MAX_LINES_VIOLATION']
-        punct_violations = [v for v in violations if v['type'] == 'MEANINGLESS_PUNCTUATION']
+        out.append(f"⚠️  {result.violation_count}個の違反が見つかりました:")
+        out.append("")
         
         if char_violations:
-            print(f"📝 文字数違反: {len(char_violations)}件")
+            out.append(f"📝 文字数違反: {result.char_violation_count}件")
             for v in char_violations[:5]:  # 最初の5件を表示
-                print(f"  エントリ#{v['index']} 行{v['line']}: {v['actual']}文字 > {v['expected']}文字")
-                print(f"    テキスト: '{v['text']}'")
-                if 'emotion_analysis' in v:
-                    analysis = v['emotion_analysis']
+                out.append(CHARS_VIOLATION_FORMAT.format(v.index, v.line, v.actual, v.expected, v.text))
+                if v.emotion_analysis is not None:
+                    analysis = v.emotion_analysis
                     if analysis['has_emotion']:
-                        print(f"    基本部分: '{analysis['base_text']}' ({analysis['base_length']}文字)")
-                        print(f"    感情部分: '{analysis['emotion_part']}' ({analysis['emotion_length']}文字)")
-            if len(char_violations) > 5:
-                print(f"    ... 他{len(char_violations)-5}件")
-            print()
+                        out.append(EMOTION_ANALYSIS_FORMAT.format_map(analysis))
+            if result.char_violation_count > 5:
+                out.append(MORE_VIOLATIONS_FORMAT.format(result.char_violation_count - 5))
+            out.append("")
         
         if line_violations:
-            print(f"📏 行数違反: {len(line_violations)}件")
+            out.append(f"📏 行数違反: {result.line_violation_count}件")
             for v in line_violations[:5]:  # 最初の5件を表示
-                print(f"  エントリ#{v['index']}: {v['actual']}行 > {v['expected']}行")
-                print(f"    テキスト: '{v['text']}'")
-            if len(line_violations) > 5:
-                print(f"    ... 他{len(line_violations)-5}件")
-            print()
+                out.append(LINES_VIOLATION_FORMAT.format(v.index, v.actual, v.expected, v.text))
+            if result.line_violation_count > 5:
+                out.append(MORE_VIOLATIONS_FORMAT.format(result.line_violation_count - 5))
+            out.append("")
         
         if punct_violations:
-            print(f"🔤 意味のない句読点: {len(punct_violations)}件")
+            out.append(f"🔤 意味のない句読点: {result.punct_violation_count}件")
             for v in punct_violations[:5]:  # 最初の5件を表示
-                print(f"  エントリ#{v['index']} 行{v['line']}: '{v['text']}'")
-            if len(punct_violations) > 5:
-                print(f"    ... 他{len(punct_violations)-5}件")
-            print()
+                out.append(PUNCT_VIOLATION_FORMAT.format(v.index, v.line, v.text))
+            if result.punct_violation_count > 5:
+                out.append(MORE_VIOLATIONS_FORMAT.format(result.punct_violation_count - 5))
+            out.append("")
     
     # Street Fighter 6実況への最適化確認
-    print("=" * 70)
-    print("🥊 Street Fighter 6実況動画最適化確認")
-    print("=" * 70)
+    out.append("=" * 70)
+    out.append("🥊 Street Fighter 6実況動画最適化確認")
+    out.append("=" * 70)
     
-    if not violations:
-        print("✅ 実況動画に最適化された字幕生成が完了")
-        print("✅ 感情表現の自然な保持により臨場感を維持")
-        print("✅ 手動調整不要の高精度同期を実現")
-        print("🚀 NextStage Gaming チャンネルの編集効率化準備完了！")
+    if not result.violation_count:
+        out.append("✅ 実況動画に最適化された字幕生成が完了")
+        out.append("✅ 感情表現の自然な保持により臨場感を維持")
+        out.append("✅ 手動調整不要の高精度同期を実現")
+        out.append("🚀 NextStage Gaming チャンネルの編集効率化準備完了！")
     else:
-        print("⚠️  一部調整が推奨されます")
-        print("• さらなる自然分割アルゴリズムの改良")
-        print("• 感情表現パターンの拡張")
+        out.append("⚠️  一部調整が推奨されます")
+        out.append("• さらなる自然分割アルゴリズムの改良")
+        out.append("• 感情表現パターンの拡張")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
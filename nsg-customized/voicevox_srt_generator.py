@@ -22,15 +22,18 @@ For: NextStage Gaming チャンネル Street Fighter 6実況動画編集効率
 Version: Final - Minimal Changes, Maximum Stability
 """
 
+import argparse
 import json
-import math
-import re
+import logging
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 # fugashi (MeCab wrapper) for natural Japanese segmentation
 try:
     from fugashi import GenericTagger
@@ -40,6 +43,14 @@ except ImportError:
     print("Warning: fugashi not available. Natural segmentation will be limited.")
     MECAB_AVAILABLE = False
 
+# orjson (optional) for faster VVPROJ parsing
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # VOICEVOX official constants
 FRAMERATE = 93.75  # 24000 / 256 [frame/sec] - VOICEVOX official framerate
 DEFAULT_SAMPLING_RATE = 24000
@@ -48,8 +59,26 @@ DEFAULT_SAMPLING_RATE = 24000
 MAX_CHARS = 26  # 基本文字数制限（感情表現は例外）
 MAX_LINES = 2  # 厳密な行数制限
 
-
-@dataclass
+# 自然な区切り点（分割位置の候補、優先度高）
+NATURAL_BREAKS = [
+    "。",
+    "！",
+    "？",
+    "、",
+    "が、",
+    "で、",
+    "て、",
+    "し、",
+    "ので、",
+    "から、",
+]
+# 区切り点の終端文字（全区切り点は句読点1文字で終わる）
+NATURAL_BREAK_END_CHARS = tuple(sorted({brk[-1] for brk in NATURAL_BREAKS}))
+# 直後で分割しやすい品詞（MeCabの品詞大分類、優先度中）
+SPLIT_AFTER_POS = frozenset(("動詞", "助詞"))
+
+
+@dataclass(slots=True)
 class Mora:
     """VOICEVOX公式準拠のMoraデータ構造"""
 
@@ -61,7 +90,7 @@ class Mora:
     pitch: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class AccentPhrase:
     """VOICEVOX公式準拠のAccentPhraseデータ構造"""
 
@@ -71,7 +100,7 @@ class AccentPhrase:
     is_interrogative: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioQuery:
     """VOICEVOX公式準拠のAudioQueryデータ構造"""
 
@@ -89,7 +118,7 @@ class AudioQuery:
     kana: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SRTEntry:
     """SRT字幕エントリ"""
 
@@ -103,113 +132,119 @@ class VOICEVOXOfficialCalculator:
     """VOICEVOX公式実装に基づく正確な時間計算クラス（既存コード完全保持）"""
 
     @staticmethod
-    def _to_frame(sec: float) -> int:
-        """VOICEVOX公式の秒→フレーム変換"""
-        sec_rounded = np.round(sec * FRAMERATE)
-        return int(sec_rounded)
+    def _to_frame(sec: np.ndarray) -> np.ndarray:
+        """VOICEVOX公式の秒→フレーム変換（配列単位で一括変換）"""
+        return np.rint(sec * FRAMERATE).astype(np.int64)
+
+    @staticmethod
+    def _moras_to_arrays(moras: List[Mora]) -> Dict[str, np.ndarray]:
+        """モーラ系列を属性ごとの配列（SoA）に変換する"""
+        count = len(moras)
+        return {
+            "vowel_length": np.fromiter(
+                (mora.vowel_length for mora in moras), dtype=np.float64, count=count
+            ),
+            "consonant_length": np.fromiter(
+                (mora.consonant_length or 0.0 for mora in moras),
+                dtype=np.float64,
+                count=count,
+            ),
+            "is_pau": np.fromiter(
+                (mora.vowel == "pau" for mora in moras), dtype=bool, count=count
+            ),
+        }
 
     @staticmethod
-    def _generate_silence_mora(length: float) -> Mora:
-        """音の長さを指定して無音モーラを生成する。"""
-        return Mora(text="　", vowel="sil", vowel_length=length, pitch=0.0)
+    def _query_dict_to_soa(query_data: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """vvprojのqueryデータ（辞書）から直接モーラ系列の配列（SoA）を構築する"""
+        vowel_length = []
+        consonant_length = []
+        is_pau = []
+        for phrase_data in query_data.get("accentPhrases", []):
+            for mora_data in phrase_data.get("moras", []):
+                vowel_length.append(mora_data.get("vowelLength", 0.0))
+                consonant_length.append(mora_data.get("consonantLength") or 0.0)
+                is_pau.append(mora_data.get("vowel", "") == "pau")
+            pause_data = phrase_data.get("pauseMora")
+            if pause_data:
+                vowel_length.append(pause_data.get("vowelLength", 0.0))
+                consonant_length.append(0.0)
+                is_pau.append(pause_data.get("vowel", "pau") == "pau")
+        return {
+            "vowel_length": np.asarray(vowel_length, dtype=np.float64),
+            "consonant_length": np.asarray(consonant_length, dtype=np.float64),
+            "is_pau": np.asarray(is_pau, dtype=bool),
+        }
 
     @staticmethod
-    def _apply_prepost_silence(moras: List[Mora], query: AudioQuery) -> List[Mora]:
+    def _apply_prepost_silence(
+        arrays: Dict[str, np.ndarray], query: AudioQuery
+    ) -> Dict[str, np.ndarray]:
         """モーラ系列へ音声合成用のクエリがもつ前後無音を付加する"""
-        pre_silence_moras = [
-            VOICEVOXOfficialCalculator._generate_silence_mora(query.prePhonemeLength)
-        ]
-        post_silence_moras = [
-            VOICEVOXOfficialCalculator._generate_silence_mora(query.postPhonemeLength)
-        ]
-        return pre_silence_moras + moras + post_silence_moras
+        # 無音モーラは子音なし・"sil"（pauではない）として扱う
+        return {
+            "vowel_length": np.concatenate(
+                (
+                    [query.prePhonemeLength],
+                    arrays["vowel_length"],
+                    [query.postPhonemeLength],
+                )
+            ),
+            "consonant_length": np.concatenate(
+                ([0.0], arrays["consonant_length"], [0.0])
+            ),
+            "is_pau": np.concatenate(([False], arrays["is_pau"], [False])),
+        }
 
     @staticmethod
-    def _apply_pause_length(moras: List[Mora], query: AudioQuery) -> List[Mora]:
+    def _apply_pause_length(
+        arrays: Dict[str, np.ndarray], query: AudioQuery
+    ) -> Dict[str, np.ndarray]:
         """モーラ系列へ音声合成用のクエリがもつ無音時間を適用する"""
         if query.pauseLength is not None:
-            for mora in moras:
-                if mora.vowel == "pau":
-                    mora.vowel_length = query.pauseLength
-        return moras
+            arrays["vowel_length"][arrays["is_pau"]] = query.pauseLength
+        return arrays
 
     @staticmethod
-    def _apply_pause_length_scale(moras: List[Mora], query: AudioQuery) -> List[Mora]:
+    def _apply_pause_length_scale(
+        arrays: Dict[str, np.ndarray], query: AudioQuery
+    ) -> Dict[str, np.ndarray]:
         """モーラ系列へ音声合成用のクエリがもつ無音時間スケールを適用する"""
-        for mora in moras:
-            if mora.vowel == "pau":
-                mora.vowel_length *= query.pauseLengthScale
-        return moras
+        arrays["vowel_length"][arrays["is_pau"]] *= query.pauseLengthScale
+        return arrays
 
     @staticmethod
-    def _apply_speed_scale(moras: List[Mora], query: AudioQuery) -> List[Mora]:
+    def _apply_speed_scale(
+        arrays: Dict[str, np.ndarray], query: AudioQuery
+    ) -> Dict[str, np.ndarray]:
         """モーラ系列へ音声合成用のクエリがもつ話速スケールを適用する"""
-        for mora in moras:
-            mora.vowel_length /= query.speedScale
-            if mora.consonant_length:
-                mora.consonant_length /= query.speedScale
-        return moras
-
-    @staticmethod
-    def _apply_pitch_scale(moras: List[Mora], query: AudioQuery) -> List[Mora]:
-        """モーラ系列へ音声合成用のクエリがもつ音高スケールを適用する"""
-        for mora in moras:
-            mora.pitch *= 2**query.pitchScale
-        return moras
-
-    @staticmethod
-    def _apply_intonation_scale(moras: List[Mora], query: AudioQuery) -> List[Mora]:
-        """モーラ系列へ音声合成用のクエリがもつ抑揚スケールを適用する"""
-        # 有声音素 (f0>0) の平均値に対する乖離度をスケール
-        voiced = [mora for mora in moras if mora.pitch > 0]
-        if voiced:
-            mean_f0 = np.mean([mora.pitch for mora in voiced])
-            if not math.isnan(mean_f0):
-                for mora in voiced:
-                    mora.pitch = (
-                        mora.pitch - mean_f0
-                    ) * query.intonationScale + mean_f0
-        return moras
+        arrays["vowel_length"] /= query.speedScale
+        arrays["consonant_length"] /= query.speedScale
+        return arrays
 
     @staticmethod
-    def _count_frame_per_unit(moras: List[Mora]) -> Tuple[np.ndarray, np.ndarray]:
-        """音素あたり・モーラあたりのフレーム長を算出する"""
-        frame_per_phoneme = []
-        frame_per_mora = []
-
-        for mora in moras:
-            vowel_frames = VOICEVOXOfficialCalculator._to_frame(mora.vowel_length)
-            consonant_frames = (
-                VOICEVOXOfficialCalculator._to_frame(mora.consonant_length)
-                if mora.consonant_length is not None
-                else 0
-            )
-            mora_frames = vowel_frames + consonant_frames
-
-            if mora.consonant:
-                frame_per_phoneme.append(consonant_frames)
-            frame_per_phoneme.append(vowel_frames)
-            frame_per_mora.append(mora_frames)
-
-        return np.array(frame_per_phoneme, dtype=np.int64), np.array(
-            frame_per_mora, dtype=np.int64
-        )
+    def _count_frame_per_mora(arrays: Dict[str, np.ndarray]) -> np.ndarray:
+        """モーラあたりのフレーム長を算出する"""
+        return VOICEVOXOfficialCalculator._to_frame(
+            arrays["vowel_length"]
+        ) + VOICEVOXOfficialCalculator._to_frame(arrays["consonant_length"])
 
     @staticmethod
-    def _apply_voicevox_processing_pipeline(
-        moras: List[Mora], query: AudioQuery, include_prepost_silence: bool = True
-    ) -> List[Mora]:
-        """VOICEVOX公式処理パイプライン"""
+    def _apply_voicevox_timing_pipeline(
+        arrays: Dict[str, np.ndarray],
+        query: AudioQuery,
+        include_prepost_silence: bool = True,
+    ) -> Dict[str, np.ndarray]:
+        """VOICEVOX公式処理パイプラインのうち、音素長に影響する処理のみを適用"""
+        # フレーム数は母音・子音長のみから求まるため、音高・抑揚スケールは適用しない
         if include_prepost_silence:
-            moras = VOICEVOXOfficialCalculator._apply_prepost_silence(moras, query)
+            arrays = VOICEVOXOfficialCalculator._apply_prepost_silence(arrays, query)
 
-        moras = VOICEVOXOfficialCalculator._apply_pause_length(moras, query)
-        moras = VOICEVOXOfficialCalculator._apply_pause_length_scale(moras, query)
-        moras = VOICEVOXOfficialCalculator._apply_speed_scale(moras, query)
-        moras = VOICEVOXOfficialCalculator._apply_pitch_scale(moras, query)
-        moras = VOICEVOXOfficialCalculator._apply_intonation_scale(moras, query)
+        arrays = VOICEVOXOfficialCalculator._apply_pause_length(arrays, query)
+        arrays = VOICEVOXOfficialCalculator._apply_pause_length_scale(arrays, query)
+        arrays = VOICEVOXOfficialCalculator._apply_speed_scale(arrays, query)
 
-        return moras
+        return arrays
 
     @staticmethod
     def calculate_accurate_duration(query: AudioQuery) -> float:
@@ -221,32 +256,126 @@ class VOICEVOXOfficialCalculator:
             if accent_phrase.pause_mora:
                 moras.append(accent_phrase.pause_mora)
 
-        # VOICEVOX公式処理パイプライン適用（前後無音込み）
-        processed_moras = (
-            VOICEVOXOfficialCalculator._apply_voicevox_processing_pipeline(
-                moras, query, include_prepost_silence=True
-            )
+        arrays = VOICEVOXOfficialCalculator._moras_to_arrays(moras)
+        return VOICEVOXOfficialCalculator._calculate_duration_from_arrays(arrays, query)
+
+    @staticmethod
+    def calculate_duration_from_dict(query_data: Dict[str, Any]) -> float:
+        """vvprojのqueryデータ（辞書）から音声時間を計算（Mora等のオブジェクトを経由しない）"""
+        arrays = VOICEVOXOfficialCalculator._query_dict_to_soa(query_data)
+        # 時間計算に必要なスカラー値のみを持つAudioQuery（音高・抑揚スケールは使わない）
+        query = AudioQuery(
+            speedScale=query_data.get("speedScale", 1.0),
+            prePhonemeLength=query_data.get("prePhonemeLength", 0.1),
+            postPhonemeLength=query_data.get("postPhonemeLength", 0.1),
+            pauseLength=query_data.get("pauseLength"),
+            pauseLengthScale=query_data.get("pauseLengthScale", 1.0),
         )
+        return VOICEVOXOfficialCalculator._calculate_duration_from_arrays(arrays, query)
 
-        # フレーム単位での計算
-        _, frame_per_mora = VOICEVOXOfficialCalculator._count_frame_per_unit(
-            processed_moras
+    @staticmethod
+    def _calculate_durations_memoized(
+        query_datas: List[Dict[str, Any]],
+    ) -> List[float]:
+        """内容が同一のqueryデータ（定型フレーズ等）は1回だけ音声時間を計算する"""
+        durations = {}
+        results = []
+        for query_data in query_datas:
+            # orjsonによる直列化結果（キー順固定）を内容の同一判定に使う
+            key = orjson.dumps(query_data, option=orjson.OPT_SORT_KEYS)
+            duration = durations.get(key)
+            if duration is None:
+                duration = durations[key] = (
+                    VOICEVOXOfficialCalculator.calculate_duration_from_dict(query_data)
+                )
+            results.append(duration)
+        return results
+
+    @staticmethod
+    def calculate_durations_batch(query_datas: List[Dict[str, Any]]) -> List[float]:
+        """複数のqueryデータの音声時間を一括計算"""
+        # query単位の処理が重いため、直列化が高速な場合は同一queryの結果を使い回す
+        if ORJSON_AVAILABLE:
+            return VOICEVOXOfficialCalculator._calculate_durations_memoized(query_datas)
+        return [
+            VOICEVOXOfficialCalculator.calculate_duration_from_dict(query_data)
+            for query_data in query_datas
+        ]
+
+    @staticmethod
+    def _calculate_duration_from_arrays(
+        arrays: Dict[str, np.ndarray], query: AudioQuery
+    ) -> float:
+        """モーラ系列の配列とクエリのスカラー値から音声時間を計算する"""
+        # VOICEVOX公式処理パイプライン適用（前後無音込み、音素長に影響する処理のみ）
+        arrays = VOICEVOXOfficialCalculator._apply_voicevox_timing_pipeline(
+            arrays, query, include_prepost_silence=True
         )
 
-        total_frame = frame_per_mora.sum()
+        # フレーム単位での計算
+        frame_per_mora = VOICEVOXOfficialCalculator._count_frame_per_mora(arrays)
+
+        total_frame = int(frame_per_mora.sum())
         return total_frame / FRAMERATE
 
 
 class AdvancedSegmentSplitter:
     """高度な字幕分割クラス（最終修正版 - 既存コードベース）"""
 
-    def __init__(self):
-        self.tagger = None
-        if MECAB_AVAILABLE:
+    # MeCabの辞書読み込みは重いため、タガーは全インスタンスで共有する
+    _TAGGER = None
+
+    @classmethod
+    def _get_tagger(cls):
+        """共有タガーを返す（初回呼び出し時に生成、利用できない場合はNone）"""
+        if cls._TAGGER is None and MECAB_AVAILABLE:
             try:
-                self.tagger = GenericTagger()
+                cls._TAGGER = GenericTagger()
             except Exception:
                 pass
+        return cls._TAGGER
+
+    def __init__(self):
+        self.tagger = self._get_tagger()
+        # 同一テキストの形態素解析結果を再利用する（定型フレーズの再解析を避ける）
+        self._tokenize = lru_cache(maxsize=4096)(self._tokenize_uncached)
+        self._split_text_smart_cached = lru_cache(maxsize=2048)(
+            self._split_text_smart_uncached
+        )
+        # 形態素解析による分割候補の探索方法は初期化時に確定する（呼び出しごとの分岐を省く）
+        self._morph_split_candidates = (
+            self._mecab_split_candidates if self.tagger else self._no_split_candidates
+        )
+
+    def _tokenize_uncached(self, text: str) -> Tuple[Tuple[str, str, str], ...]:
+        """MeCabで形態素解析し、各形態素の（直前の空白, 表層形, 品詞）をタプルで返す"""
+        return tuple(
+            (word.white_space, word.surface, word.feature[0])
+            for word in self.tagger(text)
+        )
+
+    def _mecab_split_candidates(
+        self, text: str, max_chars: int
+    ) -> List[Tuple[int, int]]:
+        """MeCab形態素解析による分割候補（位置, 優先度）を返す"""
+        candidates = []
+        try:
+            pos = 0
+            for white_space, surface, pos1 in self._tokenize(text):
+                # MeCabが読み飛ばす空白も元テキスト上の位置に含める
+                pos += len(white_space) + len(surface)
+                if 0 < pos <= max_chars:
+                    # 動詞、助詞の後は分割しやすい
+                    if pos1 in SPLIT_AFTER_POS:
+                        candidates.append((pos, 50))  # 優先度50
+        except Exception:
+            pass
+        return candidates
+
+    @staticmethod
+    def _no_split_candidates(text: str, max_chars: int) -> List[Tuple[int, int]]:
+        """MeCabが利用できない場合は形態素による分割候補なし"""
+        return []
 
     def _find_best_split_position(self, text: str, max_chars: int) -> Optional[int]:
         """
@@ -260,40 +389,16 @@ class AdvancedSegmentSplitter:
         if len(text) <= max_chars:
             return None
 
-        # 分割候補点を特定（max_chars以内のみ）
-        split_candidates = []
-
         # 自然な区切り点（優先度高）
-        natural_breaks = [
-            "。",
-            "！",
-            "？",
-            "、",
-            "が、",
-            "で、",
-            "て、",
-            "し、",
-            "ので、",
-            "から、",
-        ]
-        for break_point in natural_breaks:
-            for match in re.finditer(re.escape(break_point), text):
-                pos = match.end()
-                if 0 < pos <= max_chars:  # max_chars以内の候補のみ
-                    split_candidates.append((pos, 100))  # 優先度100
+        # 区切り点の終端は必ず句読点1文字なので、先頭max_chars文字内で最も右の句読点の直後が
+        # 最右の区切り点になる（優先度が最も高いため、見つかればそのまま採用）
+        pos = max(text.rfind(char, 0, max_chars) for char in NATURAL_BREAK_END_CHARS)
+        if pos >= 0:
+            return pos + 1
 
+        # 分割候補点を特定（max_chars以内のみ）
         # MeCabによる形態素解析分割点（優先度中）
-        if self.tagger:
-            try:
-                pos = 0
-                for word in self.tagger(text):
-                    pos += len(str(word).split("\t")[0])
-                    if 0 < pos <= max_chars:
-                        # 動詞、助詞の後は分割しやすい
-                        if any(feature in str(word) for feature in ["動詞", "助詞"]):
-                            split_candidates.append((pos, 50))  # 優先度50
-            except Exception:
-                pass
+        split_candidates = self._morph_split_candidates(text, max_chars)
 
         # 最適な分割点を選択
         if split_candidates:
@@ -311,27 +416,30 @@ class AdvancedSegmentSplitter:
         既存コードの262-270行目のバグを修正:
         - 旧: `pos - start <= max_chars` で分割候補を探す → 見つからないと分割されない
         - 新: 再帰的に確実に分割
-        """
-        if len(text) <= max_chars:
-            return [text]
 
-        # 最適な分割位置を見つける
-        split_pos = self._find_best_split_position(text, max_chars)
+        再帰呼び出しの代わりにスタックで処理する（深い分割でもスタックが伸びない）
+        """
+        result = []
+        # 前半を先に処理するため、後半→前半の順に積む
+        stack = [text]
+        while stack:
+            part = stack.pop()
+            if len(part) <= max_chars:
+                result.append(part)
+                continue
 
-        if split_pos is None or split_pos == 0:
-            # 分割不可の場合（通常は発生しない）
-            return [text[:max_chars]] if len(text) > max_chars else [text]
+            # 最適な分割位置を見つける
+            # 分割位置が0だと処理が進まないため、最低1文字は切り出す
+            split_pos = max(self._find_best_split_position(part, max_chars) or 0, 1)
 
-        # 分割
-        first_part = text[:split_pos].strip()
-        remaining_part = text[split_pos:].strip()
+            # 分割
+            first_part = part[:split_pos].strip()
+            remaining_part = part[split_pos:].strip()
 
-        # 再帰的に処理
-        result = []
-        if first_part:
-            result.extend(self._split_text_recursive(first_part, max_chars))
-        if remaining_part:
-            result.extend(self._split_text_recursive(remaining_part, max_chars))
+            if remaining_part:
+                stack.append(remaining_part)
+            if first_part:
+                stack.append(first_part)
 
         return result
 
@@ -350,6 +458,14 @@ class AdvancedSegmentSplitter:
         if len(text) <= max_chars:
             return [text]
 
+        # 同一テキスト（定型フレーズ等）の分割結果はキャッシュから返す
+        # キャッシュ内のタプルを共有しないよう、呼び出し元には新しいリストを渡す
+        return list(self._split_text_smart_cached(text, max_chars, max_lines))
+
+    def _split_text_smart_uncached(
+        self, text: str, max_chars: int, max_lines: int
+    ) -> Tuple[str, ...]:
+        """split_text_smartの本体（結果はキャッシュ可能なタプルで返す）"""
         # 再帰的分割（感情表現保護なし）
         segments = self._split_text_recursive(text, max_chars)
 
@@ -365,9 +481,9 @@ class AdvancedSegmentSplitter:
                 combined = "\n".join(group)
                 final_segments.append(combined)
                 i += max_lines
-            return final_segments
+            return tuple(final_segments)
 
-        return segments if segments else [text]
+        return tuple(segments) if segments else (text,)
 
 
 class VOICEVOXSRTGenerator:
@@ -378,8 +494,12 @@ class VOICEVOXSRTGenerator:
 
     def parse_vvproj(self, vvproj_path: str) -> Dict[str, Any]:
         """VVPROJファイルを正しい構造で解析（既存コード完全保持）"""
-        with open(vvproj_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if ORJSON_AVAILABLE:
+            with open(vvproj_path, "rb") as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(vvproj_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
 
         talk = data.get("talk", {})
 
@@ -387,9 +507,11 @@ class VOICEVOXSRTGenerator:
         audio_keys = talk.get("audioKeys", [])  # リスト（順序重要）
         audio_items = talk.get("audioItems", {})  # 辞書（キーでアクセス）
 
-        print(f"🎮 NextStage Gaming - Processing VVPROJ file: {Path(vvproj_path).name}")
-        print(f"📋 audioKeys: {len(audio_keys)} items (順序リスト)")
-        print(f"📝 audioItems: {len(audio_items)} items (辞書)")
+        logger.info(
+            "🎮 NextStage Gaming - Processing VVPROJ file: %s", Path(vvproj_path).name
+        )
+        logger.info("📋 audioKeys: %d items (順序リスト)", len(audio_keys))
+        logger.info("📝 audioItems: %d items (辞書)", len(audio_items))
 
         # 構造検証
         if not isinstance(audio_keys, list):
@@ -397,13 +519,21 @@ class VOICEVOXSRTGenerator:
         if not isinstance(audio_items, dict):
             raise ValueError(f"audioItems should be dict, got {type(audio_items)}")
 
-        # キーの一致確認
+        # キーの一致確認（件数が同じで重複がなく全キーがaudioItemsに含まれれば一致するため、
+        # 通常時はaudioItems側の集合を作らない）
         keys_set = set(audio_keys)
-        items_set = set(audio_items.keys())
-        if keys_set != items_set:
-            print(
-                f"⚠️  Warning: Keys mismatch - audioKeys: {len(keys_set)}, audioItems: {len(items_set)}"
-            )
+        if (
+            len(keys_set) != len(audio_keys)
+            or len(audio_keys) != len(audio_items)
+            or any(key not in audio_items for key in audio_keys)
+        ):
+            items_set = set(audio_items.keys())
+            if keys_set != items_set:
+                logger.warning(
+                    "⚠️  Warning: Keys mismatch - audioKeys: %d, audioItems: %d",
+                    len(keys_set),
+                    len(items_set),
+                )
 
         return {"audio_keys": audio_keys, "audio_items": audio_items}
 
@@ -460,11 +590,13 @@ class VOICEVOXSRTGenerator:
         )
 
     def format_time(self, seconds: float) -> str:
-        """秒を SRT タイムフォーマットに変換（既存コード完全保持）"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{secs:06.3f}".replace(".", ",")
+        """秒を SRT タイムフォーマットに変換"""
+        # 先にミリ秒単位の整数へ丸めることで、繰り上がり（例: 59.9996秒 → 1分）を正しく扱う
+        total_ms = int(round(seconds * 1000))
+        hours, total_ms = divmod(total_ms, 3_600_000)
+        minutes, total_ms = divmod(total_ms, 60_000)
+        secs, millis = divmod(total_ms, 1000)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
     def generate_srt(self, vvproj_path: str, output_path: Optional[str] = None) -> str:
         """VVPROJファイルからSRTファイルを生成（既存コードベース + 分割ロジックのみ修正）"""
@@ -476,32 +608,43 @@ class VOICEVOXSRTGenerator:
         srt_entries = []
         current_time = 0.0  # 連続時間軸
 
-        print(f"📝 処理対象: {len(audio_keys)} items")
+        logger.info("📝 処理対象: %d items", len(audio_keys))
+        # アイテム・セグメントごとの詳細ログは--verbose指定時のみ組み立てる
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        # 正確な音声時間計算（既存ロジック保持、全アイテムを一括計算）
+        durations = iter(
+            VOICEVOXOfficialCalculator.calculate_durations_batch(
+                [
+                    audio_items[key].get("query", {})
+                    for key in audio_keys
+                    if key in audio_items
+                ]
+            )
+        )
 
         for i, key in enumerate(audio_keys):  # audioKeysの順序で処理
             if key not in audio_items:
-                print(f"⚠️  Warning: Key {key} not found in audioItems")
+                logger.warning("⚠️  Warning: Key %s not found in audioItems", key)
                 continue
 
             item = audio_items[key]
             text = item.get("text", "")
 
-            print(f"\n🎯 Processing item {i + 1}/{len(audio_keys)}")
-            print(f"📄 テキスト: {text}")
-
-            # AudioQuery構築
-            query_data = item.get("query", {})
-            audio_query = self.convert_vvproj_to_audioquery(query_data)
-
-            # 正確な音声時間計算（既存ロジック保持）
-            duration = VOICEVOXOfficialCalculator.calculate_accurate_duration(
-                audio_query
-            )
-            print(f"⏱️  総読み上げ時間: {duration:.3f}秒")
+            duration = next(durations)
 
             # テキスト分割（修正版split_text_smart使用）
-            segments = self.splitter.split_text_smart(text, MAX_CHARS, MAX_LINES)
-            print(f"✂️  分割結果: {len(segments)} segments")
+            # MAX_CHARS以内のテキストは分割されないため、分割処理を呼ばずにそのまま使う
+            if len(text) <= MAX_CHARS:
+                segments = [text]
+            else:
+                segments = self.splitter.split_text_smart(text, MAX_CHARS, MAX_LINES)
+
+            if debug:
+                logger.debug("\n🎯 Processing item %d/%d", i + 1, len(audio_keys))
+                logger.debug("📄 テキスト: %s", text)
+                logger.debug("⏱️  総読み上げ時間: %.3f秒", duration)
+                logger.debug("✂️  分割結果: %d segments", len(segments))
 
             # 各セグメントに時間を配分（既存ロジック保持）
             if len(segments) == 1:
@@ -516,24 +659,32 @@ class VOICEVOXSRTGenerator:
                     text=segments[0],
                 )
                 srt_entries.append(entry)
-                print(f"  📝 Segment 1: {segments[0][:50]}...")
-                print(f"    ⏱️  時間: {duration:.3f}秒")
+                if debug:
+                    logger.debug("  📝 Segment 1: %s...", segments[0][:50])
+                    logger.debug("    ⏱️  時間: %.3f秒", duration)
             else:
                 # 複数セグメントの場合、文字数比で時間配分（既存ロジック保持）
-                total_chars = sum(
-                    len(s.replace("\n", "")) for s in segments
-                )  # 改行を除いた文字数
-                segment_start = current_time
+                # 改行を除いた文字数（文字列を作り直さず改行数を引く）
+                char_counts = [len(s) - s.count("\n") for s in segments]
+                total_chars = sum(char_counts)
+                if total_chars > 0:
+                    char_ratios = (
+                        np.asarray(char_counts, dtype=np.float64) / total_chars
+                    )
+                else:
+                    char_ratios = np.full(len(segments), 1.0 / len(segments))
+                # 比率の累積和から各セグメントの境界時刻を一括で求める
+                # （逐次加算による誤差の蓄積を避け、終端はアイテムの終了時刻に揃える）
+                boundaries = current_time + duration * np.concatenate(
+                    ([0.0], np.cumsum(char_ratios))
+                )
+                boundaries[-1] = current_time + duration
+                boundaries = boundaries.tolist()
 
                 for j, segment in enumerate(segments):
-                    char_count = len(segment.replace("\n", ""))  # 改行を除いた文字数
-                    char_ratio = (
-                        char_count / total_chars
-                        if total_chars > 0
-                        else 1.0 / len(segments)
-                    )
-                    segment_duration = duration * char_ratio
-                    segment_end = segment_start + segment_duration
+                    segment_start = boundaries[j]
+                    segment_end = boundaries[j + 1]
+                    segment_duration = segment_end - segment_start
 
                     entry = SRTEntry(
                         index=len(srt_entries) + 1,
@@ -542,44 +693,58 @@ class VOICEVOXSRTGenerator:
                         text=segment,
                     )
                     srt_entries.append(entry)
-                    print(
-                        f"  📝 Segment {j + 1}: {segment.replace(chr(10), ' ')[:50]}"
-                    )  # 改行を空白に置換して表示
-                    print(f"    ⏱️  時間: {segment_duration:.3f}秒")
-
-                    segment_start = segment_end
+                    if debug:
+                        # 改行を空白に置換して表示
+                        logger.debug(
+                            "  📝 Segment %d: %s",
+                            j + 1,
+                            segment.replace("\n", " ")[:50],
+                        )
+                        logger.debug("    ⏱️  時間: %.3f秒", segment_duration)
 
             # 次のアイテムのために時間を進める（連続時間軸）
             current_time += duration
 
-        # SRTファイル生成
-        srt_content = ""
-        for entry in srt_entries:
-            srt_content += f"{entry.index}\n"
-            srt_content += f"{entry.start_time} --> {entry.end_time}\n"
-            srt_content += f"{entry.text}\n\n"
-
         # ファイル出力
         if output_path is None:
             vvproj_file = Path(vvproj_path)
             output_path = vvproj_file.parent / f"{vvproj_file.stem}_auto_generated.srt"
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(srt_content)
+        # SRTファイル生成（全体を文字列に組み立てず、エントリごとにバッファ付きで書き出す）
+        with open(output_path, "w", encoding="utf-8", buffering=1 << 16) as f:
+            for entry in srt_entries:
+                f.write(
+                    f"{entry.index}\n"
+                    f"{entry.start_time} --> {entry.end_time}\n"
+                    f"{entry.text}\n\n"
+                )
 
-        print(f"\n✅ SRTファイル生成完了: {output_path}")
-        print(f"📊 総エントリ数: {len(srt_entries)}")
-        print(f"⏱️  総時間: {current_time:.3f}秒")
+        logger.info("\n✅ SRTファイル生成完了: %s", output_path)
+        logger.info("📊 総エントリ数: %d", len(srt_entries))
+        logger.info("⏱️  総時間: %.3f秒", current_time)
 
         return str(output_path)
 
 
 def main():
-    if len(sys.argv) != 2:
-        print("使用方法: python voicevox_srt_generator.py <vvproj_file>")
-        sys.exit(1)
-
-    vvproj_path = sys.argv[1]
+    parser = argparse.ArgumentParser(
+        description="VOICEVOXのvvprojファイルからSRT字幕ファイルを生成する"
+    )
+    parser.add_argument("vvproj_file", help="入力vvprojファイル")
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="アイテム・セグメントごとの処理内容を表示する",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    # 詳細ログは本モジュールのみ有効にする（依存ライブラリのデバッグ出力は抑える）
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+
+    vvproj_path = args.vvproj_file
 
     if not Path(vvproj_path).exists():
         print(f"エラー: ファイルが見つかりません: {vvproj_path}")
@@ -16,6 +16,8 @@ License:
 """
 
 import json
+import string
+from functools import lru_cache
 
 try:
     from fugashi import GenericTagger
@@ -24,143 +26,136 @@ except ImportError:
     print("[WARNING] fugashi not available, using simple tokenization")
     tagger = None
 
+# orjson（オプション）があればvvprojの読み込みに使用
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 文節の終わりとみなすトークン（集合で保持し、所属判定をハッシュ参照で行う）
+SEGMENT_END_TOKENS = frozenset(("。", "！", "？", "!", "?", "\n"))
+# 長い文節を分割する位置として使う句読点
+PUNCTUATION_MARKS = frozenset("、。")
+# 英字（ASCII）の集合（英単語の途中分断の判定に使う）
+ASCII_LETTERS = frozenset(string.ascii_letters)
+# ポーズモーラに対応するテキスト上の句読点
+PAUSE_PUNCTUATION = frozenset("、。！？")
+
 
 def is_ascii_letter(ch):
     """指定された文字が英字（ASCII）であるかを判定して返す関数。"""
-    return ('A' <= ch <= 'Z') or ('a' <= ch <= 'z')
+    return ch in ASCII_LETTERS
+
+
+@lru_cache(maxsize=4096)
+def tokenize_surfaces(text):
+    """fugashiで形態素解析した各トークンの表層形をタプルで返す関数（同一テキストの結果はキャッシュする）。"""
+    return tuple(word.surface for word in tagger(text))
 
 
 def fugashi_segment_text(text):
     """fugashiを用いてテキストを文節に分割して返す関数。"""
     if tagger is None:
         segments = []
-        current_segment = ""
+        current_parts = []
         for char in text:
-            current_segment += char
-            if char in ("。", "！", "？", "!", "?", "\n"):
-                segments.append(current_segment.strip())
-                current_segment = ""
-        if current_segment.strip():
-            segments.append(current_segment.strip())
+            current_parts.append(char)
+            if char in SEGMENT_END_TOKENS:
+                segments.append("".join(current_parts).strip())
+                current_parts = []
+        tail = "".join(current_parts).strip()
+        if tail:
+            segments.append(tail)
         return segments
     
     segments = []
-    current_segment = ""
-    for word in tagger(text):
-        current_segment += word.surface
-        if word.surface in ("。", "！", "？", "!", "?", "\n"):
-            segments.append(current_segment.strip())
-            current_segment = ""
-    if current_segment:
-        segments.append(current_segment.strip())
+    current_parts = []  # 現在の文節を構成するトークンの表層形
+    for surface in tokenize_surfaces(text):
+        current_parts.append(surface)
+        if surface in SEGMENT_END_TOKENS:
+            segments.append("".join(current_parts).strip())
+            current_parts = []
+    if current_parts:
+        segments.append("".join(current_parts).strip())
     return segments
 
 
-def calculate_audio_duration(query):
-    """
-    発話データから音声の総再生時間を計算して返す関数。
-    オリジナルと完全に同一のロジック。
+def analyze_audio_item(text, query):
     """
-    if "accentPhrases" not in query:
-        return 0.0
-    total_duration = 0.0
-    for phrase in query["accentPhrases"]:
-        total_duration += sum(
-            mora.get("vowelLength", 0.0) + mora.get("consonantLength", 0.0)
-            for mora in phrase.get("moras", [])
-        )
-        total_duration += phrase.get("pauseMora", {}).get("vowelLength", 0.0)
-    total_duration += query.get("prePhonemeLength", 0.1)
-    total_duration += query.get("postPhonemeLength", 1.0)
-    return round(total_duration, 6)
-
+    発話データ1件を1回の走査で解析し、総再生時間とテキスト・音素の対応関係を返す関数。
 
-def build_mora_list_with_text_mapping(text, accent_phrases):
+    音素ごとの辞書は作らず、次の3つを返す:
+    - 発話の総再生時間（秒）。オリジナル（voicevox-srt.py）と完全に同一のロジック・加算順で求める
+    - 音素の読み上げ時間の累積和（先頭に0.0を含み、長さは音素数+1）
+    - テキスト位置を添字とし、対応する音素のインデックスを要素とするリスト
+      （テキスト位置は先頭から連続して割り当てられる）
     """
-    テキストと音素（moras）の対応関係を順序を保持して構築する関数。
-    """
-    mora_list = []
-    text_to_mora_indices = {}
-    text_pos = 0
+    cumulative_durations = [0.0]
+    text_to_mora_indices = []
+    text_len = len(text)
+    elapsed = 0.0  # 累積和の計算用（音素を1つずつ加算）
+    total_duration = 0.0  # 総再生時間（オリジナルと同じくアクセント句単位で加算）
     
-    for phrase in accent_phrases:
-        moras = phrase.get("moras", [])
-        
-        for mora in moras:
-            mora_text = mora.get("text", "")
-            vowel_length = mora.get("vowelLength", 0.0)
-            consonant_length = mora.get("consonantLength", 0.0)
-            
-            mora_info = {
-                'text': mora_text,
-                'vowel_length': vowel_length,
-                'consonant_length': consonant_length,
-                'duration': vowel_length + consonant_length,
-                'original_text_pos': text_pos if text_pos < len(text) else -1
-            }
-            mora_list.append(mora_info)
+    for phrase in query.get("accentPhrases", []):
+        phrase_durations = []
+        for mora in phrase.get("moras", []):
+            duration = mora.get("vowelLength", 0.0) + mora.get("consonantLength", 0.0)
+            phrase_durations.append(duration)
+            elapsed += duration
+            cumulative_durations.append(elapsed)
             
             # テキスト位置との対応を記録
-            if text_pos < len(text):
-                text_to_mora_indices[text_pos] = len(mora_list) - 1
-                text_pos += 1
+            if len(text_to_mora_indices) < text_len:
+                text_to_mora_indices.append(len(cumulative_durations) - 2)
+        total_duration += sum(phrase_durations)
         
         # pauseMora の処理
         pause_mora = phrase.get("pauseMora")
         if pause_mora:
             pause_duration = pause_mora.get("vowelLength", 0.0)
-            mora_info = {
-                'text': '',
-                'vowel_length': pause_duration,
-                'consonant_length': 0.0,
-                'duration': pause_duration,
-                'original_text_pos': text_pos if text_pos < len(text) else -1,
-                'is_pause': True
-            }
-            mora_list.append(mora_info)
+            total_duration += pause_duration
+            elapsed += pause_duration
+            cumulative_durations.append(elapsed)
             
-            if text_pos < len(text) and text[text_pos] in "、。！？":
-                text_to_mora_indices[text_pos] = len(mora_list) - 1
-                text_pos += 1
+            text_pos = len(text_to_mora_indices)
+            if text_pos < text_len and text[text_pos] in PAUSE_PUNCTUATION:
+                text_to_mora_indices.append(len(cumulative_durations) - 2)
     
-    return mora_list, text_to_mora_indices
+    total_duration += query.get("prePhonemeLength", 0.1)
+    total_duration += query.get("postPhonemeLength", 1.0)
+    return round(total_duration, 6), cumulative_durations, text_to_mora_indices
 
 
-def calculate_chunk_precise_duration(chunk_text, original_text, mora_list, text_to_mora_indices):
+def calculate_chunk_precise_duration(chunk_text, chunk_start_pos, cumulative_durations, text_to_mora_indices):
     """
     分割されたチャンクテキストに対応する正確な読み上げ時間を計算する関数。
+
+    chunk_start_posはチャンクの元テキスト上の開始位置、cumulative_durationsは
+    音素の読み上げ時間の累積和（先頭に0.0を含む）。
     """
-    # チャンクテキストが元のテキストのどの位置にあるかを特定
-    chunk_start_pos = original_text.find(chunk_text)
-    if chunk_start_pos == -1:
-        print(f"[WARNING] チャンクテキスト '{chunk_text}' が元のテキストで見つかりません")
-        return 0.0, -1, -1
-    
     chunk_end_pos = chunk_start_pos + len(chunk_text) - 1
     
     # 対応する音素のインデックス範囲を特定
-    mora_start_idx = text_to_mora_indices.get(chunk_start_pos, -1)
-    mora_end_idx = text_to_mora_indices.get(chunk_end_pos, -1)
-    
-    if mora_start_idx == -1 or mora_end_idx == -1:
+    if not chunk_text or chunk_end_pos >= len(text_to_mora_indices):
         print(f"[WARNING] チャンク '{chunk_text}' に対応する音素が見つかりません")
         return 0.0, -1, -1
+    mora_start_idx = text_to_mora_indices[chunk_start_pos]
+    mora_end_idx = text_to_mora_indices[chunk_end_pos]
     
-    # 対応する音素の時間を合計
-    total_duration = 0.0
-    for i in range(mora_start_idx, mora_end_idx + 1):
-        if i < len(mora_list):
-            total_duration += mora_list[i]['duration']
+    # 対応する音素の時間を累積和の差で求める
+    total_duration = cumulative_durations[mora_end_idx + 1] - cumulative_durations[mora_start_idx]
     
     return total_duration, mora_start_idx, mora_end_idx
 
 
 def format_srt_time(time_in_seconds):
     """秒単位の時間をSRT形式（hh:mm:ss,ms）に変換して返す関数。"""
-    hours = int(time_in_seconds // 3600)
-    minutes = int((time_in_seconds % 3600) // 60)
-    seconds = int(time_in_seconds % 60)
-    milliseconds = int(round((time_in_seconds - int(time_in_seconds)) * 1000))
+    # 先にミリ秒単位の整数へ丸めることで、繰り上がり（例: 999.6ms → 1秒）を正しく扱う
+    total_ms = int(round(time_in_seconds * 1000))
+    seconds, milliseconds = divmod(total_ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
     return f"{hours:02}:{minutes:02}:{seconds:02},{milliseconds:03}"
 
 
@@ -168,21 +163,16 @@ def split_long_segment(segment, max_chars):
     """長い文節を自然な切れ目（句読点等）で分割する関数。"""
     result = []
     remaining = segment
-    punctuation_marks = "、。"
     while len(remaining) > max_chars:
-        chunk = remaining[:max_chars]
-        split_index = -1
-        for i in range(len(chunk) - 1, -1, -1):
-            if chunk[i] in punctuation_marks:
-                split_index = i + 1
-                break
-        if split_index == -1 or split_index < max_chars * 0.5:
+        # 先頭max_chars文字内で最も右の句読点の直後を分割位置とする（見つからなければ0）
+        split_index = max(remaining.rfind(mark, 0, max_chars) for mark in PUNCTUATION_MARKS) + 1
+        if split_index == 0 or split_index < max_chars * 0.5:
             split_index = max_chars
         segment_piece = remaining[:split_index].strip()
         remaining = remaining[split_index:]
-        if remaining and remaining[0] in punctuation_marks:
+        if remaining and remaining[0] in PUNCTUATION_MARKS:
             j = 0
-            while j < len(remaining) and remaining[j] in punctuation_marks:
+            while j < len(remaining) and remaining[j] in PUNCTUATION_MARKS:
                 j += 1
             segment_piece += remaining[:j]
             remaining = remaining[j:]
@@ -197,19 +187,21 @@ def token_based_split(text, max_chars):
     if tagger is None:
         tokens = text.split()
     else:
-        tokens = [token.surface for token in tagger(text)]
+        tokens = tokenize_surfaces(text)
         
     lines = []
-    current_line = ""
-    for token in tokens:
-        if len(current_line) + len(token) <= max_chars:
-            current_line += token
+    start = 0  # 現在の行の先頭トークン位置
+    line_len = 0  # 現在の行の文字数（行が確定するまで文字列は連結しない）
+    for i, token in enumerate(tokens):
+        if line_len + len(token) <= max_chars:
+            line_len += len(token)
         else:
-            if current_line:
-                lines.append(current_line)
-            current_line = token
-    if current_line:
-        lines.append(current_line)
+            if line_len:
+                lines.append("".join(tokens[start:i]))
+            start = i
+            line_len = len(token)
+    if line_len:
+        lines.append("".join(tokens[start:]))
     return lines
 
 
@@ -239,28 +231,35 @@ def adjust_line_breaks(lines, max_chars, min_line_length=7):
 
 def smart_split_text(text, max_chars):
     """日本語テキストを自然な文節に分割し、1行あたりの最大文字数以内に整形した行リストを返す関数。"""
+    # 空白を含まずmax_chars以内のテキストは分割しても1行のまま変わらないため、形態素解析を省略する
+    if len(text) <= max_chars and text.split() == [text]:
+        return [text]
     segments = fugashi_segment_text(text)
     lines = []
-    current_line = ""
+    current_parts = []  # 現在の行を構成する文節（行確定時にまとめて連結する）
+    current_len = 0  # 現在の行の文字数
     for seg in segments:
         seg = seg.strip()
         if not seg:
             continue
         if len(seg) > max_chars:
-            if current_line:
-                lines.append(current_line)
-                current_line = ""
+            if current_parts:
+                lines.append("".join(current_parts))
+                current_parts = []
+                current_len = 0
             split_segments = split_long_segment(seg, max_chars)
             lines.extend(split_segments)
         else:
-            if len(current_line) + len(seg) <= max_chars:
-                current_line += seg
+            if current_len + len(seg) <= max_chars:
+                current_parts.append(seg)
+                current_len += len(seg)
             else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = seg
-    if current_line:
-        lines.append(current_line)
+                if current_parts:
+                    lines.append("".join(current_parts))
+                current_parts = [seg]
+                current_len = len(seg)
+    if current_parts:
+        lines.append("".join(current_parts))
     lines = adjust_line_breaks(lines, max_chars, min_line_length=7)
     return lines
 
@@ -290,8 +289,12 @@ def convert_vvproj_to_srt_with_perfect_timing(vvproj_file, output_srt, max_chars
     - 終了時間: n番目の終了時間 = n+1番目の開始時間（音声の連続性を保持）
     - 最後の字幕: 全体の長さと一致
     """
-    with open(vvproj_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if ORJSON_AVAILABLE:
+        with open(vvproj_file, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(vvproj_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
     
     # VVPROJ形式対応
     talk_data = data.get("talk", {})
@@ -325,11 +328,9 @@ def convert_vvproj_to_srt_with_perfect_timing(vvproj_file, output_srt, max_chars
             print(f"[WARNING] アイテム {audio_key} にaccentPhrasesがありません。")
             continue
         
-        # オリジナルと同一の方法で総時間を計算
-        total_audio_duration = calculate_audio_duration(query)
-        
-        # テキストと音素の対応関係を構築
-        mora_list, text_to_mora_indices = build_mora_list_with_text_mapping(text, accent_phrases)
+        # オリジナルと同一の方法で総時間を計算し、同じ走査でテキストと音素の対応関係を構築
+        # （音素の読み上げ時間は累積和で持ち、チャンクごとの合計を差分1回で求める）
+        total_audio_duration, cumulative_durations, text_to_mora_indices = analyze_audio_item(text, query)
         
         # テキストを行リストに変換
         lines = smart_split_text(text, max_chars=max_chars)
@@ -343,14 +344,23 @@ def convert_vvproj_to_srt_with_perfect_timing(vvproj_file, output_srt, max_chars
         
         # 各チャンクの開始時間を計算
         current_start = global_start_time
+        # チャンクは元テキストの順に並ぶため、直前のチャンクの終端から位置を探す
+        search_pos = 0
         
         for i, chunk_lines in enumerate(line_chunks):
             chunk_text = "".join(chunk_lines)  # チャンクのテキスト全体
             
-            # 正確な読み上げ時間を計算
-            chunk_duration, mora_start_idx, mora_end_idx = calculate_chunk_precise_duration(
-                chunk_text, text, mora_list, text_to_mora_indices
-            )
+            # チャンクテキストが元のテキストのどの位置にあるかを特定
+            chunk_start_pos = text.find(chunk_text, search_pos)
+            if chunk_start_pos == -1:
+                print(f"[WARNING] チャンクテキスト '{chunk_text}' が元のテキストで見つかりません")
+                chunk_duration = 0.0
+            else:
+                search_pos = chunk_start_pos + len(chunk_text)
+                # 正確な読み上げ時間を計算
+                chunk_duration, mora_start_idx, mora_end_idx = calculate_chunk_precise_duration(
+                    chunk_text, chunk_start_pos, cumulative_durations, text_to_mora_indices
+                )
             
             # 最初のチャンクにはprePhonemeLength、最後のチャンクにはpostPhonemeLength を追加
             if i == 0:
@@ -375,28 +385,23 @@ def convert_vvproj_to_srt_with_perfect_timing(vvproj_file, output_srt, max_chars
         global_start_time += total_audio_duration
     
     # 第2パス: 終了時間を修正（n番目の終了時間 = n+1番目の開始時間）
-    for i in range(len(all_subtitles)):
-        if i < len(all_subtitles) - 1:
-            # 次の字幕の開始時間を現在の字幕の終了時間にする
-            all_subtitles[i]['end_time'] = all_subtitles[i + 1]['start_time']
-        else:
-            # 最後の字幕は全体の長さに合わせる
-            all_subtitles[i]['end_time'] = global_start_time
+    # 次の字幕の開始時間を現在の字幕の終了時間にする
+    for subtitle, next_subtitle in zip(all_subtitles, all_subtitles[1:]):
+        subtitle['end_time'] = next_subtitle['start_time']
+    if all_subtitles:
+        # 最後の字幕は全体の長さに合わせる
+        all_subtitles[-1]['end_time'] = global_start_time
     
     # 第3パス: SRTファイル生成
-    srt_lines = []
-    for i, subtitle in enumerate(all_subtitles):
-        start_srt = format_srt_time(subtitle['start_time'])
-        end_srt = format_srt_time(subtitle['end_time'])
-        
-        srt_lines.append(f"{i + 1}")
-        srt_lines.append(f"{start_srt} --> {end_srt}")
-        srt_lines.append("\n".join(subtitle['lines']))
-        srt_lines.append("")
-    
-    # SRTファイルに出力
-    with open(output_srt, "w", encoding="utf-8") as f:
-        f.write("\n".join(srt_lines))
+    # 全体を文字列に組み立てず、字幕ごとにバッファ付きでファイルへ書き出す
+    with open(output_srt, "w", encoding="utf-8", buffering=1 << 16) as f:
+        for i, subtitle in enumerate(all_subtitles):
+            start_srt = format_srt_time(subtitle['start_time'])
+            end_srt = format_srt_time(subtitle['end_time'])
+            body = "\n".join(subtitle['lines'])
+            if i:
+                f.write("\n")  # 字幕間の空行
+            f.write(f"{i + 1}\n{start_srt} --> {end_srt}\n{body}\n")
     
     print(f"完璧な時間計算によるSRTファイルを生成しました: {output_srt}")
     print(f"総SRTアイテム数: {len(all_subtitles)}")
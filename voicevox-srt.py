@@ -18,12 +18,28 @@ License:
 """
 
 import json  # JSONデータを扱うためのモジュールをインポート（JSONパース用）
+import string  # 英字の集合（string.ascii_letters）を使うためのモジュール
+from functools import lru_cache  # 同一テキストの形態素解析結果を再利用するためのキャッシュ
 
 from fugashi import GenericTagger  # GenericTaggerをインポート（柔軟な辞書形式に対応）
 
+# orjson（オプション）があればvvprojの読み込みに使用する
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # GenericTaggerを使用してMeCabの設定ファイルとUTF-8版辞書を明示的に指定して初期化する
 tagger = GenericTagger("-r /opt/homebrew/etc/mecabrc -d /opt/homebrew/lib/mecab/dic/ipadic")
 
+# 文節の終わりとみなすトークン（集合で保持し、所属判定をハッシュ参照で行う）
+SEGMENT_END_TOKENS = frozenset(("。", "！", "？", "!", "?", "\n"))
+# 長い文節を分割する位置として使う句読点
+PUNCTUATION_MARKS = frozenset("、。")
+# 英字（ASCII）の集合（英単語の途中分断の判定に使う）
+ASCII_LETTERS = frozenset(string.ascii_letters)
+
 
 def is_ascii_letter(ch):
     """
@@ -35,7 +51,23 @@ def is_ascii_letter(ch):
     Returns:
         bool: 英字であればTrue、そうでなければFalse。
     """
-    return ('A' <= ch <= 'Z') or ('a' <= ch <= 'z')
+    return ch in ASCII_LETTERS
+
+
+@lru_cache(maxsize=4096)
+def tokenize_surfaces(text):
+    """
+    fugashiでテキストを形態素解析し、各トークンの表層形をタプルで返す関数。
+
+    同じテキスト（定型フレーズや行のマージ結果）の再解析を避けるため、結果をキャッシュする。
+
+    Args:
+        text (str): 入力テキスト。
+
+    Returns:
+        tuple[str, ...]: トークンの表層形のタプル。
+    """
+    return tuple(word.surface for word in tagger(text))
 
 
 def fugashi_segment_text(text):
@@ -49,14 +81,14 @@ def fugashi_segment_text(text):
         list[str]: 分割された文節のリスト。
     """
     segments = []  # 分割結果を格納するリスト
-    current_segment = ""  # 現在の文節を保持する文字列
-    for word in tagger(text):
-        current_segment += word.surface  # トークンの表層形を文節に追加
-        if word.surface in ("。", "！", "？", "!", "?", "\n"):
-            segments.append(current_segment.strip())  # 現在の文節をリストに追加
-            current_segment = ""  # 文節をリセット
-    if current_segment:
-        segments.append(current_segment.strip())  # 残った文節を追加
+    current_parts = []  # 現在の文節を構成するトークンの表層形
+    for surface in tokenize_surfaces(text):
+        current_parts.append(surface)  # トークンの表層形を文節に追加
+        if surface in SEGMENT_END_TOKENS:
+            segments.append("".join(current_parts).strip())  # 現在の文節をリストに追加
+            current_parts = []  # 文節をリセット
+    if current_parts:
+        segments.append("".join(current_parts).strip())  # 残った文節を追加
     return segments
 
 
@@ -94,10 +126,11 @@ def format_srt_time(time_in_seconds):
     Returns:
         str: SRT形式のタイムスタンプ文字列。
     """
-    hours = int(time_in_seconds // 3600)
-    minutes = int((time_in_seconds % 3600) // 60)
-    seconds = int(time_in_seconds % 60)
-    milliseconds = int(round((time_in_seconds - int(time_in_seconds)) * 1000))
+    # 先にミリ秒単位の整数へ丸めることで、繰り上がり（例: 999.6ms → 1秒）を正しく扱う
+    total_ms = int(round(time_in_seconds * 1000))
+    seconds, milliseconds = divmod(total_ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
     return f"{hours:02}:{minutes:02}:{seconds:02},{milliseconds:03}"
 
 
@@ -117,22 +150,17 @@ def split_long_segment(segment, max_chars):
     """
     result = []
     remaining = segment
-    punctuation_marks = "、。"
     while len(remaining) > max_chars:
-        chunk = remaining[:max_chars]
-        split_index = -1
-        for i in range(len(chunk) - 1, -1, -1):
-            if chunk[i] in punctuation_marks:
-                split_index = i + 1
-                break
-        if split_index == -1 or split_index < max_chars * 0.5:
+        # 先頭max_chars文字内で最も右の句読点の直後を分割位置とする（見つからなければ0）
+        split_index = max(remaining.rfind(mark, 0, max_chars) for mark in PUNCTUATION_MARKS) + 1
+        if split_index == 0 or split_index < max_chars * 0.5:
             split_index = max_chars
         segment_piece = remaining[:split_index].strip()
         remaining = remaining[split_index:]
         # もし残り部分の先頭が句読点であれば、これを前のセグメントに付加して句読点の孤立を防ぐ
-        if remaining and remaining[0] in punctuation_marks:
+        if remaining and remaining[0] in PUNCTUATION_MARKS:
             j = 0
-            while j < len(remaining) and remaining[j] in punctuation_marks:
+            while j < len(remaining) and remaining[j] in PUNCTUATION_MARKS:
                 j += 1
             segment_piece += remaining[:j]
             remaining = remaining[j:]
@@ -153,18 +181,20 @@ def token_based_split(text, max_chars):
     Returns:
         list[str]: 形態素境界で分割された行のリスト。
     """
-    tokens = [token.surface for token in tagger(text)]
+    tokens = tokenize_surfaces(text)
     lines = []
-    current_line = ""
-    for token in tokens:
-        if len(current_line) + len(token) <= max_chars:
-            current_line += token
+    start = 0  # 現在の行の先頭トークン位置
+    line_len = 0  # 現在の行の文字数（行が確定するまで文字列は連結しない）
+    for i, token in enumerate(tokens):
+        if line_len + len(token) <= max_chars:
+            line_len += len(token)
         else:
-            if current_line:
-                lines.append(current_line)
-            current_line = token
-    if current_line:
-        lines.append(current_line)
+            if line_len:
+                lines.append("".join(tokens[start:i]))
+            start = i
+            line_len = len(token)
+    if line_len:
+        lines.append("".join(tokens[start:]))
     return lines
 
 
@@ -224,28 +254,35 @@ def smart_split_text(text, max_chars):
     Returns:
         str: 改行を含む整形済みテキスト。
     """
+    # 空白を含まずmax_chars以内のテキストは分割しても1行のまま変わらないため、形態素解析を省略する
+    if len(text) <= max_chars and text.split() == [text]:
+        return text
     segments = fugashi_segment_text(text)
     lines = []
-    current_line = ""
+    current_parts = []  # 現在の行を構成する文節（行確定時にまとめて連結する）
+    current_len = 0  # 現在の行の文字数
     for seg in segments:
         seg = seg.strip()
         if not seg:
             continue
         if len(seg) > max_chars:
-            if current_line:
-                lines.append(current_line)
-                current_line = ""
+            if current_parts:
+                lines.append("".join(current_parts))
+                current_parts = []
+                current_len = 0
             split_segments = split_long_segment(seg, max_chars)
             lines.extend(split_segments)
         else:
-            if len(current_line) + len(seg) <= max_chars:
-                current_line += seg
+            if current_len + len(seg) <= max_chars:
+                current_parts.append(seg)
+                current_len += len(seg)
             else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = seg
-    if current_line:
-        lines.append(current_line)
+                if current_parts:
+                    lines.append("".join(current_parts))
+                current_parts = [seg]
+                current_len = len(seg)
+    if current_parts:
+        lines.append("".join(current_parts))
     lines = adjust_line_breaks(lines, max_chars, min_line_length=7)
     return "\n".join(lines)
 
@@ -263,32 +300,34 @@ def convert_vvproj_to_srt(vvproj_file, output_srt, max_chars):
     Returns:
         None
     """
-    with open(vvproj_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if ORJSON_AVAILABLE:
+        with open(vvproj_file, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(vvproj_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
     talk_data = data.get("talk", {})
     audio_items = talk_data.get("audioItems", {})
     if not audio_items:
         print("audioItemsが見つかりません。JSONの構造を確認してください。")
         return
-    srt_lines = []
     start_time = 0.0
-    for idx, (key, item) in enumerate(audio_items.items()):
-        text = item.get("text", "")
-        text = smart_split_text(text, max_chars=max_chars)
-        query = item.get("query", {})
-        duration = calculate_audio_duration(query)
-        if duration == 0.0:
-            print(f"アイテム {key} のdurationが0です。")
-        end_time = start_time + duration
-        start_srt = format_srt_time(start_time)
-        end_srt = format_srt_time(end_time)
-        srt_lines.append(f"{idx + 1}")
-        srt_lines.append(f"{start_srt} --> {end_srt}")
-        srt_lines.append(text)
-        srt_lines.append("")
-        start_time = end_time
-    with open(output_srt, "w", encoding="utf-8") as f:
-        f.write("\n".join(srt_lines))
+    # 全体を文字列に組み立てず、エントリごとにバッファ付きでファイルへ書き出す
+    with open(output_srt, "w", encoding="utf-8", buffering=1 << 16) as f:
+        for idx, (key, item) in enumerate(audio_items.items()):
+            text = item.get("text", "")
+            text = smart_split_text(text, max_chars=max_chars)
+            query = item.get("query", {})
+            duration = calculate_audio_duration(query)
+            if duration == 0.0:
+                print(f"アイテム {key} のdurationが0です。")
+            end_time = start_time + duration
+            start_srt = format_srt_time(start_time)
+            end_srt = format_srt_time(end_time)
+            if idx:
+                f.write("\n")  # エントリ間の空行
+            f.write(f"{idx + 1}\n{start_srt} --> {end_srt}\n{text}\n")
+            start_time = end_time
     print(f"SRTファイルを生成しました: {output_srt}")
 
 